@@ -0,0 +1,23 @@
+"""
+Shared pytest fixtures
+"""
+
+import os
+import pytest
+
+# Public RPC endpoints used when the environment does not provide one
+TEST_RPC_URLS = {
+    "ETHEREUM_RPC_URL": "https://eth.llamarpc.com",
+    "POLYGON_RPC_URL": "https://polygon-rpc.com",
+    "ARBITRUM_RPC_URL": "https://arb1.arbitrum.io/rpc",
+}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def rpc_urls():
+    """Configure RPC URLs for every network once per test session"""
+    for name, url in TEST_RPC_URLS.items():
+        os.environ.setdefault(name, url)
+    # Keep token metadata in memory rather than in the user's persistent cache
+    os.environ.pop("TOKEN_CACHE_PATH", None)
+    yield TEST_RPC_URLS
@@ -3,22 +3,80 @@ Performance tests to verify optimizations work correctly
 """
 
 import time
-import os
+import json
+import threading
+import timeit
 from collections import deque
-from vibeagent.agent import VibeAgent
+import pytest
+from unittest.mock import Mock, PropertyMock, patch
+from eth_abi import encode as abi_encode
+from vibeagent.agent import (
+    ERC20_DECIMALS_SELECTOR,
+    QUOTE_PROBES_PER_MULTICALL,
+    ERC20_SYMBOL_SELECTOR,
+    ETH_USD_PRICE_KEY,
+    VibeAgent,
+    _to_checksum_address,
+)
 from vibeagent.config import AgentConfig
 from vibeagent.logger import VibeLogger
-from vibeagent.execution_engine import ExecutionEngine
+from vibeagent.execution_engine import ApprovalRecord, ExecutionEngine
+from vibeagent.avocado_integration import AvocadoIntegration
+from vibeagent.token_cache import TokenCache
+
+# Shared read-only opportunity for the execution engine tests
+OPPORTUNITY = {
+    "type": "arbitrage",
+    "estimated_profit_usd": 100,
+    "strategy": {
+        "type": "flashloan_arbitrage",
+        "steps": [{"action": "flashloan", "amount": 10}],
+    },
+}
+
+
+def tier_quotes(*amounts):
+    """Multicall3 aggregate3 result for Uniswap V3 fee tiers (None for a missing pool)"""
+    return [
+        (False, b"") if amount is None else (True, abi_encode(["uint256"], [amount]))
+        for amount in amounts
+    ]
+
+
+def path_quote(*amounts):
+    """Multicall3 aggregate3 result for a SushiSwap getAmountsOut quote"""
+    return [(True, abi_encode(["uint256[]"], [list(amounts)]))]
+
+
+def best_time(func, repeat=5):
+    """Best wall time of func over several runs, after one untimed warm-up call"""
+    func()
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+# Function-scoped on purpose: the tests fill caches, counters and approvals, and a shared
+# instance would need resetting through private attributes. A fresh agent costs about a
+# millisecond because the RPC client comes from _get_web3.
+@pytest.fixture
+def agent():
+    """Fresh VibeAgent per test; the Web3 client and its sessions are shared via _get_web3"""
+    return VibeAgent(network="ethereum", price_cache_ttl=60)
+
+
+@pytest.fixture
+def engine():
+    """Fresh ExecutionEngine per test"""
+    config = AgentConfig()
+    config.avocado_wallet_address = "0x1234567890123456789012345678901234567890"
+    logger = VibeLogger(log_file=None, transaction_log_file=None)
+    return ExecutionEngine(config, logger, "ethereum")
 
 
 class TestPriceCache:
     """Test price caching functionality"""
 
-    def test_price_cache_hit(self):
+    def test_price_cache_hit(self, agent):
         """Test that price cache returns cached values within TTL"""
-        os.environ["ETHEREUM_RPC_URL"] = "https://eth.llamarpc.com"
-        agent = VibeAgent(network="ethereum", price_cache_ttl=60)
-
         # WETH and USDC addresses on Ethereum
         weth = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
         usdc = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
@@ -31,9 +89,9 @@ class TestPriceCache:
             return
 
         # Second call within TTL - should use cache
-        start_time = time.time()
+        start_time = time.perf_counter()
         price2 = agent._get_dex_price(weth, usdc, "uniswap_v3")
-        cache_time = time.time() - start_time
+        cache_time = time.perf_counter() - start_time
 
         # Cache hit should be very fast (< 10ms to account for test overhead)
         assert cache_time < 0.01, f"Cache hit took {cache_time}s, expected < 0.01s"
@@ -41,8 +99,7 @@ class TestPriceCache:
 
     def test_price_cache_expiry(self):
         """Test that price cache expires after TTL"""
-        os.environ["ETHEREUM_RPC_URL"] = "https://eth.llamarpc.com"
-        agent = VibeAgent(network="ethereum", price_cache_ttl=1)  # 1 second TTL
+        agent = VibeAgent(network="ethereum", price_cache_ttl=1)
 
         weth = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
         usdc = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
@@ -66,6 +123,490 @@ class TestPriceCache:
             price2, (int, float)
         ), "Should return valid price or None"
 
+    def test_stale_price_served_while_refreshing(self):
+        """Test that expired prices are returned at once and refreshed in the background"""
+        agent = VibeAgent(network="ethereum", price_cache_ttl=60, price_cache_stale_ok=True)
+
+        weth = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+        usdc = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+        agent._price_cache[("uniswap_v3", weth, usdc)] = (2500.0, 0, False)
+
+        with patch.object(agent, "_fetch_dex_prices", return_value={"uniswap_v3": 2600.0}) as fetch:
+            assert agent._get_dex_price(weth, usdc, "uniswap_v3") == 2500.0
+            # A refresh is already in flight, so no second one is queued
+            assert agent._get_dex_price(weth, usdc, "uniswap_v3") == 2500.0
+            agent._refresh_executor.shutdown(wait=True)
+
+        fetch.assert_called_once_with(weth, usdc, ["uniswap_v3"])
+
+    def test_eth_price_memoized(self, agent):
+        """Test that ETH price lookups within the TTL skip the DEX quote"""
+        with patch.object(agent, "_get_chainlink_eth_price", return_value=None), patch.object(
+            agent, "_get_dex_prices", return_value={"uniswap_v3": 2500.0}
+        ) as get_prices:
+            assert agent._get_eth_price_usd() == 2500.0
+            assert agent._get_eth_price_usd() == 2500.0
+
+        assert get_prices.call_count == 1
+
+    def test_eth_price_fallback_not_memoized(self, agent):
+        """Test that the fallback ETH price is not cached"""
+        with patch.object(agent, "_get_chainlink_eth_price", return_value=None):
+            with patch.object(agent, "_get_dex_prices", return_value={}):
+                assert agent._get_eth_price_usd() == 2000.0
+
+            with patch.object(agent, "_get_dex_prices", return_value={"sushiswap": 2400.0}):
+                assert agent._get_eth_price_usd() == 2400.0
+
+    def test_eth_price_from_chainlink(self, agent):
+        """Test that a fresh Chainlink answer is used without quoting any DEX"""
+        round_types = ["uint80", "int256", "uint256", "uint256", "uint80"]
+        now = int(time.time())
+        eth = Mock()
+        eth.call.return_value = abi_encode(round_types, [1, 3100 * 10**8, now, now, 1])
+
+        with patch.object(agent.web3, "eth", eth), patch.object(
+            agent, "_get_dex_prices"
+        ) as get_prices:
+            assert agent._get_eth_price_usd() == 3100.0
+        assert get_prices.call_count == 0
+
+        # An answer older than a day is ignored
+        eth.call.return_value = abi_encode(round_types, [1, 3100 * 10**8, 0, now - 2 * 86400, 1])
+        with patch.object(agent.web3, "eth", eth):
+            assert agent._get_chainlink_eth_price() is None
+
+    def test_stale_eth_price_served_while_refreshing(self):
+        """Test that an expired ETH/USD price is returned at once and refreshed in the background"""
+        agent = VibeAgent(network="ethereum", price_cache_stale_ok=True)
+        agent._price_cache[ETH_USD_PRICE_KEY] = (2500.0, 0, False)
+
+        # Hold the refresh in flight until both lookups have been served
+        release = threading.Event()
+        with patch.object(
+            agent, "_get_chainlink_eth_price", side_effect=lambda: release.wait(5) and 2600.0
+        ) as chainlink:
+            assert agent._get_eth_price_usd() == 2500.0
+            # A refresh is already in flight, so no second one is queued
+            assert agent._get_eth_price_usd() == 2500.0
+            release.set()
+            agent._refresh_executor.shutdown(wait=True)
+
+        chainlink.assert_called_once_with()
+        assert agent._price_cache[ETH_USD_PRICE_KEY][0] == 2600.0
+
+    def test_stale_gas_price_served_while_refreshing(self):
+        """Test that an expired gas price is returned at once and refreshed in the background"""
+        agent = VibeAgent(network="ethereum", price_cache_stale_ok=True)
+        agent._gas_price_cache = (20 * 10**9, 0, False)
+
+        with patch.object(agent, "_fetch_gas_price", return_value=30 * 10**9) as fetch:
+            assert agent._get_gas_price() == 20 * 10**9
+            # A refresh is already in flight, so no second one is queued
+            assert agent._get_gas_price() == 20 * 10**9
+            agent._refresh_executor.shutdown(wait=True)
+
+        fetch.assert_called_once_with()
+
+    def test_gas_price_cached_per_block(self, agent):
+        """Test that repeated gas cost estimates reuse one gas price RPC"""
+        eth = Mock()
+        gas_price = PropertyMock(return_value=20 * 10**9)
+        type(eth).gas_price = gas_price
+        with patch.object(agent.web3, "eth", eth), patch.object(
+            agent, "_get_eth_price_usd", return_value=2000.0
+        ):
+            first = agent._estimate_gas_cost(gas_units=500000)
+            second = agent._estimate_gas_cost(gas_units=500000)
+
+        # 20 gwei * 500k gas = 0.01 ETH = $20 at $2000/ETH
+        assert first == second == 20
+        assert gas_price.call_count == 1
+
+
+class TestBatchedPriceFetching:
+    """Test that DEX quotes are fetched in a single batch"""
+
+    def test_quotes_share_one_batch(self, agent):
+        """Test that all uncached DEX quotes go out in one batch and are cached"""
+        weth = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+        usdc = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+
+        # One multicall: a result per Uniswap fee tier, then SushiSwap's amounts along the path
+        quotes = [tier_quotes(None, 2 * 10**18, None, None) + path_quote(10**18, 3 * 10**18)]
+        with patch.object(agent, "_get_token_decimals", return_value=18), patch.object(
+            agent, "_batch_call", return_value=quotes
+        ) as batch_call:
+            prices = agent._get_dex_prices(weth, usdc, ["uniswap_v3", "sushiswap"])
+            cached = agent._get_dex_prices(weth, usdc, ["uniswap_v3", "sushiswap"])
+
+        assert prices == {"uniswap_v3": 2.0, "sushiswap": 3.0}
+        assert cached == prices
+        assert batch_call.call_count == 1
+        (call,) = batch_call.call_args[0][0]
+        assert len(call.args[0]) == 5
+
+    def test_best_uniswap_fee_tier_wins(self, agent):
+        """Test that all fee tiers are probed in one call and the best quote is used"""
+        weth = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+        usdc = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+
+        quotes = [tier_quotes(2 * 10**18, 5 * 10**18, 3 * 10**18, None)]
+        with patch.object(agent, "_get_token_decimals", return_value=18), patch.object(
+            agent, "_batch_call", return_value=quotes
+        ) as batch_call:
+            prices = agent._get_dex_prices(weth, usdc, ["uniswap_v3"])
+
+        assert prices == {"uniswap_v3": 5.0}
+        (call,) = batch_call.call_args[0][0]
+        assert call.fn_name == "aggregate3"
+        assert len(call.args[0]) == 4
+
+        # No pool on any tier means no price rather than a zero price
+        agent._price_cache.clear()
+        with patch.object(agent, "_get_token_decimals", return_value=18), patch.object(
+            agent, "_batch_call", return_value=[tier_quotes(None, None, None, None)]
+        ):
+            assert agent._get_dex_prices(weth, usdc, ["uniswap_v3"]) == {}
+
+    def test_missing_pool_does_not_fail_other_quotes(self, agent):
+        """Test that every quote is a revert-safe multicall and failures only drop that DEX"""
+        weth = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+        usdc = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+
+        quotes = [tier_quotes(None, 2 * 10**18, None, None) + [(False, b"")]]
+        with patch.object(agent, "_get_token_decimals", return_value=18), patch.object(
+            agent, "_batch_call", return_value=quotes
+        ) as batch_call:
+            prices = agent._get_dex_prices(weth, usdc, ["uniswap_v3", "sushiswap"])
+
+        assert prices == {"uniswap_v3": 2.0}
+        assert [call.fn_name for call in batch_call.call_args[0][0]] == ["aggregate3"]
+
+    def test_prefetch_shares_one_batch_across_pairs(self, agent):
+        """Test that prefetching quotes every pair in one batch and warms the cache"""
+        weth = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+        usdc = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+        dai = "0x6B175474E89094C44Da98b954EedeAC495271d0F"
+
+        quotes = [
+            tier_quotes(None, None, 2 * 10**18, None)
+            + path_quote(10**18, 3 * 10**18)
+            + tier_quotes(4 * 10**18, None, None, None)
+            + path_quote(10**18, 5 * 10**18)
+        ]
+        with patch.object(agent, "_prefetch_token_metadata"), patch.object(
+            agent, "_get_token_decimals", return_value=18
+        ), patch.object(agent, "_batch_call", return_value=quotes) as batch_call:
+            agent.prefetch_dex_prices([(weth, usdc), (weth, dai)], ["uniswap_v3", "sushiswap"])
+            usdc_prices = agent._get_dex_prices(weth, usdc, ["uniswap_v3", "sushiswap"])
+            dai_prices = agent._get_dex_prices(weth, dai, ["uniswap_v3", "sushiswap"])
+
+        assert batch_call.call_count == 1
+        assert len(batch_call.call_args[0][0]) == 1
+        assert usdc_prices == {"uniswap_v3": 2.0, "sushiswap": 3.0}
+        assert dai_prices == {"uniswap_v3": 4.0, "sushiswap": 5.0}
+
+    def test_quote_multicalls_respect_probe_limit(self, agent):
+        """Test that quotes for many pairs are split across multicalls at the probe limit"""
+        pairs = [
+            ("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2", f"0x{i:040x}") for i in range(1, 31)
+        ]
+        quotes = [
+            tier_quotes(*[10**18] * 4) * (QUOTE_PROBES_PER_MULTICALL // 4),
+            tier_quotes(*[10**18] * 4) * (30 - QUOTE_PROBES_PER_MULTICALL // 4),
+        ]
+        with patch.object(agent, "_prefetch_token_metadata"), patch.object(
+            agent, "_get_token_decimals", return_value=18
+        ), patch.object(agent, "_batch_call", return_value=quotes) as batch_call:
+            agent.prefetch_dex_prices(pairs, ["uniswap_v3"])
+
+        calls = batch_call.call_args[0][0]
+        assert [len(call.args[0]) for call in calls] == [QUOTE_PROBES_PER_MULTICALL, 20]
+        assert len(agent._price_cache) == 30
+
+    def test_token_metadata_shares_one_batch(self, agent):
+        """Test that cold token metadata is fetched in one batch and then cached"""
+        dai = "0x6B175474E89094C44Da98b954EedeAC495271d0F"
+        wbtc = "0x2260FAC5E5542a773Aa44fBCfeDf7C193bc2C599"
+
+        with patch.object(agent, "_batch_call", return_value=[18, "DAI", 8, "WBTC"]) as batch_call:
+            agent._prefetch_token_metadata([dai, wbtc, dai.lower()])
+            agent._prefetch_token_metadata([dai, wbtc])
+
+        assert batch_call.call_count == 1
+        assert len(batch_call.call_args[0][0]) == 4
+        assert agent._get_token_decimals(wbtc.lower()) == 8
+        assert agent._get_token_symbol(dai) == "DAI"
+
+    def test_batch_size_limit(self):
+        """Test that calls are split into batches of at most rpc_batch_size"""
+        agent = VibeAgent(network="ethereum", rpc_batch_size=2, rpc_concurrency=1)
+
+        with patch.object(agent.web3, "batch_requests") as batch_requests:
+            batch = batch_requests.return_value.__enter__.return_value
+            batch.execute.side_effect = [[1, 2], [3, 4]]
+            calls = [object() for _ in range(5)]
+            # The trailing single call skips batching and is called directly
+            calls[4] = type("Call", (), {"call": lambda self: 5})()
+            results = agent._batch_call(calls)
+
+        assert results == [1, 2, 3, 4, 5]
+        assert batch_requests.call_count == 2
+
+    def test_sequential_fallback_without_batch_support(self):
+        """Test that calls go out one by one on the caller's thread when web3 cannot batch"""
+        with patch("vibeagent.agent._supports_batch_requests", return_value=False), patch(
+            "vibeagent.agent._supports_concurrent_batches", return_value=False
+        ):
+            agent = VibeAgent(network="ethereum", rpc_batch_size=2, rpc_concurrency=3)
+
+        threads = []
+
+        def make_call(value):
+            def call():
+                threads.append(threading.current_thread())
+                return value
+
+            return Mock(call=call)
+
+        with patch.object(agent.web3, "batch_requests") as batch_requests:
+            results = agent._batch_call([make_call(i) for i in range(5)])
+
+        assert results == [0, 1, 2, 3, 4]
+        assert batch_requests.call_count == 0
+        assert set(threads) == {threading.current_thread()}
+
+    def test_batches_sent_concurrently(self):
+        """Test that batches overlap in flight and results keep the call order"""
+        with patch("vibeagent.agent._supports_concurrent_batches", return_value=True):
+            agent = VibeAgent(network="ethereum", rpc_batch_size=2, rpc_concurrency=3)
+
+        # Each batch waits for the others; sequential batches would break the barrier
+        barrier = threading.Barrier(3, timeout=5)
+
+        def batch(chunk):
+            barrier.wait()
+            return [call * 10 for call in chunk]
+
+        with patch.object(agent, "_call_batch", side_effect=batch):
+            results = agent._batch_call(list(range(6)))
+
+        assert results == [0, 10, 20, 30, 40, 50]
+
+
+class TestArbitrageProfitThreshold:
+    """Test that spreads below the profit threshold skip gas estimation"""
+
+    PAIR = (
+        "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",
+        "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+    )
+    DEXES = ["uniswap_v3", "sushiswap"]
+    # $1 spread on a 10 ETH loan is $10 gross, below the $50 threshold
+    NARROW = {"uniswap_v3": 2000.0, "sushiswap": 2001.0}
+    WIDE = {"uniswap_v3": 2000.0, "sushiswap": 2010.0}
+
+    def _analyze(self, agent, prices):
+        with patch.object(agent, "_prefetch_token_metadata"), patch.object(
+            agent, "_get_token_symbol", return_value="TKN"
+        ), patch.object(agent, "_get_dex_prices", return_value=prices):
+            return agent.analyze_arbitrage_opportunity(self.PAIR, self.DEXES)
+
+    def test_narrow_spread_skips_gas_lookup(self, agent):
+        """Test that a narrow spread on a cold agent makes no gas call and flags the cost"""
+        with patch.object(agent, "_estimate_gas_cost") as estimate_gas, patch.object(
+            agent, "_fetch_gas_price"
+        ) as fetch_gas:
+            narrow = self._analyze(agent, self.NARROW)
+
+        assert estimate_gas.call_count == 0
+        assert fetch_gas.call_count == 0
+        assert narrow["profitable"] is False
+        assert narrow["gas_cost_usd"] == 0
+        assert narrow["gas_cost_estimated"] is False
+        assert narrow["estimated_profit_usd"] == 10.0
+
+    def test_narrow_spread_uses_cached_gas_cost(self, agent):
+        """Test that once gas prices are cached, narrow spreads report net profit without RPC"""
+        eth = Mock()
+        gas_price = PropertyMock(return_value=20 * 10**9)
+        type(eth).gas_price = gas_price
+        with patch.object(agent.web3, "eth", eth), patch.object(
+            agent, "_get_chainlink_eth_price", return_value=2000.0
+        ) as chainlink:
+            wide = self._analyze(agent, self.WIDE)
+            narrow = self._analyze(agent, self.NARROW)
+
+        # 20 gwei * 500k gas = 0.01 ETH = $20 at $2000/ETH
+        assert wide["profitable"] is True
+        assert wide["estimated_profit_usd"] == 80.0
+        assert narrow["profitable"] is False
+        assert narrow["gas_cost_usd"] == 20
+        assert narrow["gas_cost_estimated"] is True
+        assert narrow["estimated_profit_usd"] == -10.0
+        # Only the wide spread looked up gas and ETH/USD
+        assert gas_price.call_count == 1
+        assert chainlink.call_count == 1
+
+
+class TestBatchedLiquidationScan:
+    """Test that liquidation checks fetch all accounts in one batch"""
+
+    def test_accounts_share_one_multicall(self, agent):
+        """Test that several accounts are checked from one Multicall3 call"""
+        unhealthy = "0x1111111111111111111111111111111111111111"
+        healthy = "0x2222222222222222222222222222222222222222"
+        missing = "0x3333333333333333333333333333333333333333"
+        # (collateral, debt, available, threshold, ltv, health factor)
+        account_types = ["uint256"] * 6
+        multicall_result = [
+            (True, abi_encode(account_types, [2000 * 10**8, 1000 * 10**8, 0, 0, 0, 9 * 10**17])),
+            (True, abi_encode(account_types, [2000 * 10**8, 1000 * 10**8, 0, 0, 0, 2 * 10**18])),
+            (False, b""),
+        ]
+        with patch.object(
+            agent, "_batch_call", return_value=[multicall_result]
+        ) as batch_call, patch.object(agent, "_estimate_gas_cost", return_value=10):
+            opportunities = agent.analyze_liquidation_opportunity(
+                protocol="aave", account=unhealthy, accounts=[healthy, missing]
+            )
+
+        assert batch_call.call_count == 1
+        (call,) = batch_call.call_args[0][0]
+        assert call.fn_name == "aggregate3"
+        assert len(call.args[0]) == 3
+        assert [opp["account"] for opp in opportunities] == [unhealthy]
+        # 5% bonus on 50% of $1000 debt, minus $10 gas
+        assert opportunities[0]["estimated_profit_usd"] == 15.0
+
+    def test_accounts_chunked_per_multicall(self, agent):
+        """Test that large account lists are split across multicalls"""
+        accounts = ["0x%040x" % i for i in range(1, 251)]
+
+        with patch.object(agent, "_batch_call", return_value=[None, None, None]) as batch_call:
+            account_data = agent._fetch_account_data(accounts)
+
+        assert [len(call.args[0]) for call in batch_call.call_args[0][0]] == [100, 100, 50]
+        assert account_data == [None] * len(accounts)
+
+
+class TestPersistentTokenCache:
+    """Test token metadata persistence across restarts"""
+
+    def test_metadata_survives_restart(self, tmp_path):
+        """Test that cached metadata is reloaded by a new agent on the same network"""
+        path = str(tmp_path / "tokens.sqlite")
+        wbtc = "0x2260FAC5E5542a773Aa44fBCfeDf7C193bc2C599"
+
+        agent = VibeAgent(network="ethereum", token_cache_path=path)
+        with patch.object(agent, "_batch_call", return_value=[8, "WBTC"]):
+            agent._prefetch_token_metadata([wbtc])
+
+        restarted = VibeAgent(network="ethereum", token_cache_path=path)
+        with patch.object(restarted, "_batch_call") as batch_call:
+            restarted._prefetch_token_metadata([wbtc])
+        assert batch_call.call_count == 0
+        assert restarted._get_token_decimals(wbtc) == 8
+        assert restarted._get_token_symbol(wbtc) == "WBTC"
+
+        # Entries are scoped per network
+        assert (wbtc, "decimals") not in TokenCache(path, "polygon")
+
+    def test_common_tokens_preseeded(self):
+        """Test that WETH and USDC metadata is known without any RPC"""
+        agent = VibeAgent(network="polygon")
+        usdc = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
+
+        with patch.object(agent, "_batch_call") as batch_call, patch.object(
+            agent, "_erc20_call"
+        ) as erc20_call:
+            agent._prefetch_token_metadata([usdc])
+            assert agent._get_token_decimals(usdc) == 6
+            assert agent._get_token_symbol(usdc) == "USDC"
+
+        assert batch_call.call_count == 0
+        assert erc20_call.call_count == 0
+
+
+class TestSharedWeb3:
+    """Test Web3 client reuse across agents"""
+
+    def test_agents_share_web3_per_rpc_url(self):
+        """Test that agents on the same RPC URL reuse one pooled client"""
+        agent1 = VibeAgent(network="ethereum")
+        agent2 = VibeAgent(network="ethereum")
+        agent3 = VibeAgent(network="polygon")
+
+        assert agent1.web3 is agent2.web3
+        assert agent1.web3 is not agent3.web3
+
+        # Requests are bounded rather than left on the library default
+        assert agent1.web3.provider.get_request_kwargs()["timeout"] == 10
+
+
+class TestChecksumAddressCache:
+    """Test memoized address checksumming"""
+
+    def test_checksum_memoized(self):
+        """Test that repeated addresses skip the keccak hash"""
+        usdc = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+        expected = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+
+        assert _to_checksum_address(usdc) == expected
+        hits_before = _to_checksum_address.cache_info().hits
+        assert _to_checksum_address(usdc) == expected
+        assert _to_checksum_address.cache_info().hits == hits_before + 1
+
+
+class TestAIInsightsCache:
+    """Test caching of AI strategy insights"""
+
+    def test_insights_reused_for_same_opportunity_shape(self, agent):
+        """Test that opportunities differing only in prices share one completion"""
+        client = Mock()
+        client.chat.completions.create.return_value.choices = [
+            Mock(message=Mock(content="Split the trade"))
+        ]
+        opportunity = {
+            "type": "arbitrage",
+            "dexes": ["uniswap_v3", "sushiswap"],
+            "buy_dex": "sushiswap",
+            "sell_dex": "uniswap_v3",
+            "price_difference_pct": 0.8,
+        }
+
+        with patch.object(agent, "openai_client", client):
+            assert agent._call_openai_for_strategy(opportunity) == "Split the trade"
+            repeat = {**opportunity, "price_difference_pct": 1.2}
+            assert agent._call_openai_for_strategy(repeat) == "Split the trade"
+            assert client.chat.completions.create.call_count == 1
+
+            agent._call_openai_for_strategy({**opportunity, "buy_dex": "uniswap_v3"})
+            assert client.chat.completions.create.call_count == 2
+
+        assert client.chat.completions.create.call_args.kwargs["model"] == agent.openai_model
+
+
+class TestRawTokenCalls:
+    """Test ERC20 metadata reads through precomputed selectors"""
+
+    def test_metadata_decoded_from_raw_call(self, agent):
+        """Test that decimals and symbol come from raw eth_calls with fixed selectors"""
+        wbtc = "0x2260FAC5E5542a773Aa44fBCfeDf7C193bc2C599"
+
+        eth = Mock()
+        eth.call.side_effect = [abi_encode(["uint8"], [8]), abi_encode(["string"], ["WBTC"])]
+        with patch.object(agent.web3, "eth", eth):
+            assert agent._get_token_decimals(wbtc) == 8
+            assert agent._get_token_symbol(wbtc) == "WBTC"
+
+        assert [call.args[0] for call in eth.call.call_args_list] == [
+            {"to": wbtc, "data": ERC20_DECIMALS_SELECTOR},
+            {"to": wbtc, "data": ERC20_SYMBOL_SELECTOR},
+        ]
+        assert ERC20_DECIMALS_SELECTOR.hex() == "313ce567"
+
 
 class TestDequePerformance:
     """Test deque-based opportunity storage"""
@@ -93,11 +634,12 @@ class TestDequePerformance:
         for i in range(10000):
             opportunities.append({"id": i})
 
+        def append_batch():
+            for i in range(1000):
+                opportunities.append({"id": 10000 + i})
+
         # Measure append time
-        start_time = time.time()
-        for i in range(1000):
-            opportunities.append({"id": 10000 + i})
-        elapsed = time.time() - start_time
+        elapsed = best_time(append_batch)
 
         # Should complete in under 10ms
         assert elapsed < 0.01, f"Deque append took {elapsed}s, expected < 10ms"
@@ -106,27 +648,12 @@ class TestDequePerformance:
 class TestIncrementalCounters:
     """Test incremental stats counters"""
 
-    def test_stats_counters_accuracy(self):
+    def test_stats_counters_accuracy(self, engine):
         """Test that incremental counters match actual execution results"""
-        os.environ["ETHEREUM_RPC_URL"] = "https://eth.llamarpc.com"
-        config = AgentConfig()
-        config.avocado_wallet_address = "0x1234567890123456789012345678901234567890"
-        logger = VibeLogger(log_file="/tmp/test_perf.log")
-        engine = ExecutionEngine(config, logger, "ethereum")
-
         # Execute some opportunities
-        opportunity = {
-            "type": "arbitrage",
-            "estimated_profit_usd": 100,
-            "strategy": {
-                "type": "flashloan_arbitrage",
-                "steps": [{"action": "flashloan", "amount": 10}],
-            },
-        }
-
         # Execute multiple times
         for _ in range(5):
-            engine._execute_opportunity(opportunity)
+            engine._execute_opportunity(OPPORTUNITY)
 
         stats = engine.get_stats()
         assert stats["total_executions"] == 5
@@ -134,127 +661,224 @@ class TestIncrementalCounters:
         assert stats["failed"] == 0
         assert stats["total_profit_usd"] == 500.0
 
-    def test_stats_performance(self):
+    def test_stats_performance(self, engine):
         """Test that stats calculation is O(1) not O(n)"""
-        os.environ["ETHEREUM_RPC_URL"] = "https://eth.llamarpc.com"
-        config = AgentConfig()
-        config.avocado_wallet_address = "0x1234567890123456789012345678901234567890"
-        logger = VibeLogger(log_file="/tmp/test_perf.log")
-        engine = ExecutionEngine(config, logger, "ethereum")
-
         # Add many execution records
-        for i in range(1000):
-            engine.execution_history.append(
-                {
-                    "status": "success",
-                    "actual_profit_usd": 10,
-                }
-            )
-            engine._stats_counters["total_executions"] += 1
-            engine._stats_counters["successful"] += 1
-            engine._stats_counters["total_profit_usd"] += 10
+        engine.bulk_record({"status": "success", "actual_profit_usd": 10} for _ in range(1000))
+
+        def read_stats():
+            for _ in range(100):
+                engine.get_stats()
 
         # Measure stats retrieval time
-        start_time = time.time()
-        for _ in range(100):
-            stats = engine.get_stats()
-        elapsed = time.time() - start_time
+        elapsed = best_time(read_stats)
+        stats = engine.get_stats()
 
         # Should complete in under 10ms (100 microseconds per call average)
         assert elapsed < 0.01, f"Stats retrieval took {elapsed}s, expected < 0.01s"
+        assert stats["total_executions"] == 1000
+        assert stats["total_profit_usd"] == 10000.0
 
+    def test_history_capacity_bounded(self):
+        """Test that execution history keeps only the newest records"""
+        config = AgentConfig()
+        logger = VibeLogger(log_file=None, transaction_log_file=None)
+        engine = ExecutionEngine(config, logger, "ethereum", history_capacity=3)
 
-class TestPendingApprovalsOptimization:
-    """Test optimized pending approvals tracking"""
+        for i in range(5):
+            engine.execution_history.append({"id": i})
 
-    def test_pending_ids_tracking(self):
-        """Test that pending IDs list is maintained correctly"""
-        os.environ["ETHEREUM_RPC_URL"] = "https://eth.llamarpc.com"
-        config = AgentConfig()
-        config.avocado_wallet_address = "0x1234567890123456789012345678901234567890"
-        logger = VibeLogger(log_file="/tmp/test_perf.log")
-        engine = ExecutionEngine(config, logger, "ethereum")
+        assert [record["id"] for record in engine.get_execution_history()] == [2, 3, 4]
+        assert [record["id"] for record in engine.get_execution_history(limit=2)] == [3, 4]
+        stats = engine.get_stats()
+        assert stats["history_size"] == 3
+        assert stats["history_capacity"] == 3
 
-        opportunity = {
-            "type": "arbitrage",
-            "estimated_profit_usd": 100,
-            "strategy": {"type": "flashloan_arbitrage", "steps": []},
-        }
 
+class TestPendingApprovalsOptimization:
+    """Test optimized pending approvals tracking"""
+
+    def test_pending_ids_tracking(self, engine):
+        """Test that approvals move from pending to the archive"""
         # Submit for approval
-        approval_id = engine.submit_for_approval(opportunity)
-        assert approval_id in engine._pending_ids
+        approval_id = engine.submit_for_approval(OPPORTUNITY)
+        assert approval_id in engine.pending
         assert len(engine.get_pending_approvals()) == 1
 
         # Approve transaction
         engine.approve_transaction(approval_id)
-        assert approval_id not in engine._pending_ids
+        assert approval_id not in engine.pending
+        assert engine.archive[approval_id].status == "approved"
         assert len(engine.get_pending_approvals()) == 0
 
-    def test_pending_approvals_performance(self):
-        """Test that pending approvals query scales with pending items not total"""
-        os.environ["ETHEREUM_RPC_URL"] = "https://eth.llamarpc.com"
-        config = AgentConfig()
-        config.avocado_wallet_address = "0x1234567890123456789012345678901234567890"
-        logger = VibeLogger(log_file="/tmp/test_perf.log")
-        engine = ExecutionEngine(config, logger, "ethereum")
+    def test_pending_approvals_view_is_live(self, engine):
+        """Test that pending_approvals tracks both maps without copying them"""
+        view = engine.pending_approvals
+        approval_id = engine.submit_for_approval(OPPORTUNITY)
+        assert view[approval_id]["status"] == "pending"
 
-        opportunity = {
-            "type": "arbitrage",
-            "estimated_profit_usd": 100,
-            "strategy": {"type": "flashloan_arbitrage", "steps": []},
-        }
+        engine.reject_transaction(approval_id)
+        assert view[approval_id]["status"] == "rejected"
+        assert len(view) == 1
+        with pytest.raises(TypeError):
+            view[approval_id] = {}
 
+    def test_pending_approvals_performance(self, engine):
+        """Test that pending approvals query scales with pending items not total"""
         # Add many approved/rejected approvals
         for i in range(1000):
             approval_id = f"old_approval_{i}"
-            engine.pending_approvals[approval_id] = {
-                "opportunity": opportunity,
-                "status": "approved",
-            }
+            engine.archive[approval_id] = ApprovalRecord(OPPORTUNITY, status="approved")
 
         # Add few pending approvals
         for i in range(5):
-            engine.submit_for_approval(opportunity)
+            engine.submit_for_approval(OPPORTUNITY)
+
+        def query_pending():
+            for _ in range(100):
+                engine.get_pending_approvals()
 
         # Measure pending approvals query time
-        start_time = time.time()
-        for _ in range(100):
-            pending = engine.get_pending_approvals()
-        elapsed = time.time() - start_time
+        elapsed = best_time(query_pending)
+        pending = engine.get_pending_approvals()
 
         assert len(pending) == 5
         # Should be fast even with 1000 total approvals
         assert elapsed < 0.01, f"Pending query took {elapsed}s, expected < 10ms"
 
 
+class TestTransactionBatchExport:
+    """Test building transaction batches without a JSON round-trip"""
+
+    def test_build_matches_export(self, tmp_path):
+        """Test that the built batch dict matches the exported JSON"""
+        avocado = AvocadoIntegration(
+            wallet_address="0x1234567890123456789012345678901234567890", network="ethereum"
+        )
+        opportunity = {
+            "type": "arbitrage",
+            "strategy": {
+                "type": "arbitrage",
+                "steps": [{"action": "repay_flash_loan", "protocol": "aave_v3"}],
+                "estimated_profit_usd": 100,
+                "deadline": 300,
+            },
+        }
+
+        batch = avocado.build_transaction_batch(opportunity)
+        exported = json.loads(avocado.export_for_transaction_builder(opportunity))
+
+        assert batch["meta"]["risk_level"] == "low"
+        assert batch["meta"]["estimated_profit"] == 100
+        batch["meta"].pop("timestamp")
+        exported["meta"].pop("timestamp")
+        assert batch == exported
+
+        # The file export writes the same JSON through the shared helper
+        path = tmp_path / "batch.json"
+        saved = json.loads(avocado.export_for_transaction_builder(opportunity, str(path)))
+        assert json.loads(path.read_text()) == saved
+        saved["meta"].pop("timestamp")
+        assert saved == exported
+
+    def test_step_dispatch(self):
+        """Test that steps map to actions through the builder table"""
+        avocado = AvocadoIntegration(
+            wallet_address="0x1234567890123456789012345678901234567890", network="ethereum"
+        )
+        weth = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+        usdc = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+        strategy = {
+            "type": "arbitrage",
+            "steps": [
+                {"action": "flash_loan", "protocol": "aave_v3", "token": weth, "amount": "10"},
+                {"action": "swap", "dex": "sushiswap", "from": weth, "to": usdc},
+                {"action": "repay_flash_loan", "protocol": "aave_v3"},
+                {"action": "unknown"},
+            ],
+        }
+
+        actions = avocado.strategy_to_avocado_transactions(strategy)["transactions"]
+        assert [action["description"] for action in actions] == [
+            "Flash loan from aave_v3",
+            "Swap on sushiswap",
+        ]
+
+    def test_encoders_reuse_bound_contracts(self):
+        """Test that calldata encoding never rebuilds contract objects"""
+        avocado = AvocadoIntegration(
+            wallet_address="0x1234567890123456789012345678901234567890", network="ethereum"
+        )
+        weth = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+        usdc = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+
+        with patch.object(avocado.web3.eth, "contract") as contract:
+            assert avocado._encode_flash_loan_call(weth, "10") != "0x"
+            assert avocado._encode_swap_call("uniswap_v3", weth, usdc) != "0x"
+            assert avocado._encode_swap_call("sushiswap", weth, usdc) != "0x"
+            assert avocado._encode_liquidation_call(weth, usdc, weth) != "0x"
+        assert contract.call_count == 0
+
+    def test_repeated_strategy_reuses_encoding(self):
+        """Test that identical strategies are encoded once within the cache TTL"""
+        avocado = AvocadoIntegration(
+            wallet_address="0x1234567890123456789012345678901234567890", network="ethereum"
+        )
+        weth = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+        usdc = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+        strategy = {
+            "type": "arbitrage",
+            "steps": [{"action": "swap", "dex": "sushiswap", "from": weth, "to": usdc}],
+        }
+
+        with patch.object(
+            avocado, "_encode_swap_call", wraps=avocado._encode_swap_call
+        ) as encode_swap:
+            first = avocado.strategy_to_avocado_transactions(strategy)
+            first["transactions"][0]["meta"]["dex"] = "modified"
+            second = avocado.strategy_to_avocado_transactions(strategy)
+
+        assert encode_swap.call_count == 1
+        assert second["transactions"][0]["meta"]["dex"] == "sushiswap"
+        assert second["transactions"][0]["data"] == first["transactions"][0]["data"]
+
+    def test_encoding_cache_evicts_least_recently_used(self):
+        """Test that a cache hit keeps a strategy's encoding over older unused ones"""
+        avocado = AvocadoIntegration(
+            wallet_address="0x1234567890123456789012345678901234567890", network="ethereum"
+        )
+        weth = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+
+        def strategy(dex):
+            return {"type": "arbitrage", "steps": [{"action": "swap", "dex": dex, "from": weth}]}
+
+        with patch.object(avocado, "TX_CACHE_SIZE", 2), patch.object(
+            avocado, "_encode_swap_call", return_value="0x01"
+        ) as encode_swap:
+            for dex in ("uniswap_v3", "sushiswap", "uniswap_v3", "curve"):
+                avocado.strategy_to_avocado_transactions(strategy(dex))
+            assert encode_swap.call_count == 3
+
+            # uniswap_v3 was used more recently than sushiswap, so sushiswap was evicted
+            avocado.strategy_to_avocado_transactions(strategy("uniswap_v3"))
+            assert encode_swap.call_count == 3
+            avocado.strategy_to_avocado_transactions(strategy("sushiswap"))
+            assert encode_swap.call_count == 4
+
+    def test_encoding_cache_keyed_by_wallet(self):
+        """Test that actions encoded for one wallet are not reused for another"""
+        avocado = AvocadoIntegration(
+            wallet_address="0x1234567890123456789012345678901234567890", network="ethereum"
+        )
+        strategy = {"type": "arbitrage", "steps": [{"action": "swap", "dex": "sushiswap"}]}
+
+        with patch.object(avocado, "_encode_swap_call", return_value="0x01") as encode_swap:
+            avocado.strategy_to_avocado_transactions(strategy)
+            avocado.wallet_address = "0x0000000000000000000000000000000000000001"
+            avocado.strategy_to_avocado_transactions(strategy)
+
+        assert encode_swap.call_count == 2
+
+
 if __name__ == "__main__":
-    print("Running performance tests...")
-
-    print("\n1. Testing price cache...")
-    test = TestPriceCache()
-    test.test_price_cache_hit()
-    print("   ✓ Price cache hit works correctly")
-
-    print("\n2. Testing deque performance...")
-    test = TestDequePerformance()
-    test.test_deque_maxlen_behavior()
-    print("   ✓ Deque maxlen behavior correct")
-    test.test_deque_performance()
-    print("   ✓ Deque append is O(1)")
-
-    print("\n3. Testing incremental counters...")
-    test = TestIncrementalCounters()
-    test.test_stats_counters_accuracy()
-    print("   ✓ Stats counters are accurate")
-    test.test_stats_performance()
-    print("   ✓ Stats calculation is O(1)")
-
-    print("\n4. Testing pending approvals optimization...")
-    test = TestPendingApprovalsOptimization()
-    test.test_pending_ids_tracking()
-    print("   ✓ Pending IDs tracking works correctly")
-    test.test_pending_approvals_performance()
-    print("   ✓ Pending approvals query scales well")
-
-    print("\n✅ All performance tests passed!")
+    raise SystemExit(pytest.main([__file__, "-v"]))
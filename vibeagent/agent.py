@@ -2,27 +2,113 @@
 Core AI Agent for DeFi Strategy Generation
 """
 
+import contextvars
+import json
+import logging
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from web3 import Web3
+from eth_abi import decode as abi_decode, encode as abi_encode
+from eth_utils import function_signature_to_4byte_selector
 import openai
+import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 from .contract_abis import (
     ERC20_ABI,
     UNISWAP_V3_QUOTER_ABI,
     SUSHISWAP_ROUTER_ABI,
     AAVE_V3_POOL_ABI,
+    MULTICALL3_ABI,
     CONTRACT_ADDRESSES,
 )
+from .token_cache import TokenCache
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # DEX names
 DEX_UNISWAP_V3 = "uniswap_v3"
 DEX_SUSHISWAP = "sushiswap"
 
+# Keep-alive connections held open per RPC host
+RPC_POOL_MAXSIZE = 32
+
+# Per-request RPC timeout (seconds); failed calls are retried by web3 itself
+RPC_TIMEOUT_SECONDS = 10
+
+# Conservative ETH/USD price used when no DEX quote is available
+ETH_PRICE_FALLBACK_USD = 2000.0
+
+# Chainlink ETH/USD feeds answer with 8 decimals; answers older than a day
+# (longer than any supported feed's heartbeat) are treated as unavailable
+CHAINLINK_LATEST_ROUND_DATA_SELECTOR = function_signature_to_4byte_selector("latestRoundData()")
+CHAINLINK_ROUND_DATA_TYPES = ["uint80", "int256", "uint256", "uint256", "uint80"]
+CHAINLINK_ANSWER_DECIMALS = 8
+CHAINLINK_MAX_AGE_SECONDS = 86400
+
+# Price cache key of the network's ETH/USD price (DEX quotes use (dex, token_a, token_b))
+ETH_USD_PRICE_KEY = ("eth_usd",)
+
+# Gas price is reused for about one Ethereum block (seconds)
+GAS_PRICE_CACHE_TTL = 12
+
+# ERC20 metadata selectors, computed once rather than per call from the ABI
+ERC20_DECIMALS_SELECTOR = function_signature_to_4byte_selector("decimals()")
+ERC20_SYMBOL_SELECTOR = function_signature_to_4byte_selector("symbol()")
+
+# Uniswap V3 fee tiers probed for every quote (0.01%, 0.05%, 0.3%, 1%)
+UNISWAP_V3_FEE_TIERS = (100, 500, 3000, 10000)
+
+# Quote calls encoded by hand so they can be wrapped in Multicall3 requests
+UNISWAP_V3_QUOTE_SELECTOR = function_signature_to_4byte_selector(
+    "quoteExactInputSingle(address,address,uint24,uint256,uint160)"
+)
+SUSHISWAP_AMOUNTS_OUT_SELECTOR = function_signature_to_4byte_selector(
+    "getAmountsOut(uint256,address[])"
+)
+
+# Quote probes packed into one Multicall3 call; each quoter probe costs ~100-150k gas,
+# so this keeps a call well under common node gas caps
+QUOTE_PROBES_PER_MULTICALL = 100
+
+# Aave getUserAccountData, encoded by hand to pack many accounts into one Multicall3 call
+AAVE_USER_ACCOUNT_DATA_SELECTOR = function_signature_to_4byte_selector(
+    "getUserAccountData(address)"
+)
+AAVE_USER_ACCOUNT_DATA_TYPES = ["uint256"] * 6
+
+# Accounts checked per Multicall3 call when scanning for liquidations; getUserAccountData
+# walks every reserve, so this keeps one eth_call well under common node gas caps
+LIQUIDATION_ACCOUNTS_PER_MULTICALL = 100
+
+# Background workers refreshing expired prices when stale prices may be served
+PRICE_REFRESH_WORKERS = 4
+
+# Chat model for strategy insights (override with OPENAI_MODEL)
+OPENAI_DEFAULT_MODEL = "gpt-4o-mini"
+
+# Seconds AI insights are reused for opportunities with the same shape
+AI_INSIGHTS_CACHE_TTL = 600
+
+# Opportunity fields that determine the AI insights; prices and profits are left out
+AI_INSIGHTS_KEY_FIELDS = ("type", "protocol", "dexes", "token_pair", "buy_dex", "sell_dex")
+
+# Minimum net profit for an arbitrage to count as profitable
+MIN_ARBITRAGE_PROFIT_USD = 50
+
+# Powers of ten for token decimals; uint256 amounts never exceed 10**77
+POW10 = tuple(10**i for i in range(78))
+
+# Decimals of the COMMON_TOKENS entries, the same on every supported network
+COMMON_TOKEN_DECIMALS = {"WETH": 18, "USDC": 6}
+
 # Common token addresses for price fetching
 COMMON_TOKENS = {
     "ethereum": {
@@ -40,6 +126,46 @@ COMMON_TOKENS = {
 }
 
 
+@lru_cache(maxsize=None)
+def _get_web3(rpc_url: str) -> Web3:
+    """
+    Get the shared Web3 client for an RPC URL
+
+    Agents on the same endpoint share one pooled keep-alive session, so new
+    agents (and each scan tick) skip the TCP/TLS handshake.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=RPC_POOL_MAXSIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    provider = Web3.HTTPProvider(
+        rpc_url, session=session, request_kwargs={"timeout": RPC_TIMEOUT_SECONDS}
+    )
+    return Web3(provider)
+
+
+def _supports_batch_requests(web3: Web3) -> bool:
+    """Whether this web3 version can send JSON-RPC batches (web3.py 7+)"""
+    return hasattr(web3, "batch_requests")
+
+
+def _supports_concurrent_batches(web3: Web3) -> bool:
+    """
+    Whether batches can be built from several threads at once
+
+    Newer web3 versions keep the in-progress batch in a ContextVar, so each
+    thread builds its own; older ones keep it on the shared provider.
+    """
+    batching_context = getattr(web3.provider, "_batching_context", None)
+    return _supports_batch_requests(web3) and isinstance(batching_context, contextvars.ContextVar)
+
+
+@lru_cache(maxsize=4096)
+def _to_checksum_address(address: str) -> str:
+    """Checksum an address, memoized because the keccak hash dominates the cost"""
+    return Web3.to_checksum_address(address)
+
+
 class VibeAgent:
     """
     AI-powered agent for generating DeFi strategies including:
@@ -48,21 +174,77 @@ class VibeAgent:
     - Transaction building for Avocado multi-sig wallet
     """
 
-    def __init__(self, network: str = "ethereum", price_cache_ttl: int = 30):
+    def __init__(
+        self,
+        network: str = "ethereum",
+        price_cache_ttl: int = 30,
+        rpc_batch_size: int = 20,
+        rpc_concurrency: int = 4,
+        price_cache_stale_ok: bool = False,
+        token_cache_path: Optional[str] = None,
+    ):
         """
         Initialize the VibeAgent
 
         Args:
             network: Blockchain network (ethereum, polygon, arbitrum)
             price_cache_ttl: Time-to-live for price cache in seconds (default: 30)
+            rpc_batch_size: Maximum number of calls per JSON-RPC batch (default: 20)
+            rpc_concurrency: Maximum number of batches in flight at once (default: 4;
+                batches are sent one at a time if web3 cannot batch from several threads)
+            price_cache_stale_ok: Serve expired DEX, ETH/USD and gas prices while refreshing
+                them in the background (default: False)
+            token_cache_path: SQLite file persisting token decimals/symbols across
+                restarts (default: TOKEN_CACHE_PATH env var, in-memory if unset)
         """
         self.network = network
         self.web3 = self._initialize_web3(network)
         self.openai_client = self._initialize_openai()
+        self.openai_model = os.getenv("OPENAI_MODEL", OPENAI_DEFAULT_MODEL)
         self.strategies = []
-        self._token_cache = {}  # Cache for token decimals and symbols
-        self._price_cache = {}  # Cache for DEX prices with TTL
-        self._price_cache_ttl = price_cache_ttl
+        # Cache for token decimals and symbols: (address, field) -> value
+        token_cache_path = token_cache_path or os.getenv("TOKEN_CACHE_PATH")
+        self._token_cache = TokenCache(token_cache_path, network) if token_cache_path else {}
+        # Known tokens never need a metadata RPC, even on a cold start
+        for symbol, address in COMMON_TOKENS.get(network, {}).items():
+            for field, value in (("decimals", COMMON_TOKEN_DECIMALS[symbol]), ("symbol", symbol)):
+                if (address, field) not in self._token_cache:
+                    self._token_cache[(address, field)] = value
+        # (dex, token_a, token_b) or ETH_USD_PRICE_KEY -> (price, deadline_ns, refreshing)
+        self._price_cache = {}
+        self._price_ttl_ns = int(price_cache_ttl * 1e9)
+        self._refresh_executor = (
+            ThreadPoolExecutor(max_workers=PRICE_REFRESH_WORKERS) if price_cache_stale_ok else None
+        )
+        # Serializes claiming expired prices so concurrent callers queue one refresh
+        self._refresh_lock = threading.Lock()
+        self._gas_price_cache = None  # (gas_price_wei, deadline_ns, refreshing)
+        self._ai_insights_cache = {}  # opportunity key -> (insights, deadline_ns)
+        self.rpc_batch_size = max(1, rpc_batch_size)
+        # Fall back to individual calls, sent one batch at a time, on older web3 versions
+        self._rpc_batching = _supports_batch_requests(self.web3)
+        self._rpc_executor = (
+            ThreadPoolExecutor(max_workers=rpc_concurrency)
+            if rpc_concurrency > 1 and _supports_concurrent_batches(self.web3)
+            else None
+        )
+
+        # Bind quote and lending contracts once; rebuilding them per call re-parses the ABI
+        addresses = CONTRACT_ADDRESSES[network]
+        self._aave_pool = self.web3.eth.contract(
+            address=addresses["aave_v3_pool"], abi=AAVE_V3_POOL_ABI
+        )
+        self._quote_contracts = {
+            DEX_UNISWAP_V3: self.web3.eth.contract(
+                address=addresses["uniswap_v3_quoter"], abi=UNISWAP_V3_QUOTER_ABI
+            ),
+            DEX_SUSHISWAP: self.web3.eth.contract(
+                address=addresses["sushiswap_router"], abi=SUSHISWAP_ROUTER_ABI
+            ),
+        }
+        self._multicall = self.web3.eth.contract(
+            address=addresses["multicall3"], abi=MULTICALL3_ABI
+        )
 
     def _initialize_web3(self, network: str) -> Web3:
         """Initialize Web3 connection based on network"""
@@ -76,7 +258,7 @@ class VibeAgent:
         if not rpc_url:
             raise ValueError(f"Invalid network: {network}")
 
-        return Web3(Web3.HTTPProvider(rpc_url))
+        return _get_web3(rpc_url)
 
     def _initialize_openai(self):
         """Initialize OpenAI client for AI-powered analysis"""
@@ -99,24 +281,26 @@ class VibeAgent:
         """
         token_a, token_b = token_pair
 
-        print(f"Analyzing arbitrage for {token_a[:8]}.../{token_b[:8]}... across {dexes}")
+        logger.debug("Analyzing arbitrage for %.8s.../%.8s... across %s", token_a, token_b, dexes)
+
+        # Cold tokens: fetch decimals and symbols for both in one round-trip
+        self._prefetch_token_metadata(token_pair)
 
         # Get token symbols for display
         symbol_a = self._get_token_symbol(token_a)
         symbol_b = self._get_token_symbol(token_b)
-        print(f"Token pair: {symbol_a}/{symbol_b}")
+        logger.debug("Token pair: %s/%s", symbol_a, symbol_b)
 
-        # Fetch prices from each DEX
+        # Fetch prices from all DEXes in one batched round-trip
         prices = {}
-        for dex in dexes:
-            price = self._get_dex_price(token_a, token_b, dex)
+        for dex, price in self._get_dex_prices(token_a, token_b, dexes).items():
             if price:
                 prices[dex] = price
-                print(f"{dex}: {price:.6f} {symbol_b} per {symbol_a}")
+                logger.debug("%s: %.6f %s per %s", dex, price, symbol_b, symbol_a)
 
         # Check if we have at least 2 prices to compare
         if len(prices) < 2:
-            print("Not enough price data to analyze arbitrage")
+            logger.info("Not enough price data to analyze arbitrage")
             return {
                 "type": "arbitrage",
                 "token_pair": token_pair,
@@ -137,7 +321,7 @@ class VibeAgent:
 
         # Calculate price difference percentage
         price_diff_pct = ((max_price - min_price) / min_price) * 100
-        print(f"Price difference: {price_diff_pct:.2f}%")
+        logger.debug("Price difference: %.2f%%", price_diff_pct)
 
         # Estimate profit with 10 ETH flash loan (example)
         flash_loan_amount = 10  # ETH
@@ -147,18 +331,32 @@ class VibeAgent:
         profit_per_token = max_price - min_price
         estimated_profit = flash_loan_amount * profit_per_token
 
-        # Estimate gas cost
         gas_estimate = 500000  # Complex arbitrage with flash loan
-        gas_cost_usd = self._estimate_gas_cost(gas_estimate)
-
-        # Calculate net profit
-        net_profit = estimated_profit - gas_cost_usd
-        profitable = net_profit > 50  # Min $50 profit threshold
-
-        print(f"Estimated profit: ${estimated_profit:.2f}")
-        print(f"Gas cost: ${gas_cost_usd:.2f}")
-        print(f"Net profit: ${net_profit:.2f}")
-        print(f"Profitable: {profitable}")
+        if estimated_profit <= MIN_ARBITRAGE_PROFIT_USD:
+            # Gas only lowers profit, so this spread cannot clear the threshold: skip the
+            # gas RPCs and use already-cached prices, or 0 (flagged) if there are none yet
+            cached_gas_cost = self._cached_gas_cost_usd(gas_estimate)
+            gas_cost_estimated = cached_gas_cost is not None
+            gas_cost_usd = cached_gas_cost if gas_cost_estimated else 0
+            net_profit = estimated_profit - gas_cost_usd
+            profitable = False
+        else:
+            gas_cost_usd = self._estimate_gas_cost(gas_estimate)
+            gas_cost_estimated = True
+            net_profit = estimated_profit - gas_cost_usd
+            profitable = net_profit > MIN_ARBITRAGE_PROFIT_USD
+
+        logger.debug("Estimated profit: $%.2f, gas cost: $%.2f", estimated_profit, gas_cost_usd)
+
+        logger.info(
+            "%s/%s: %.2f%% spread, net profit $%.2f%s (profitable: %s)",
+            symbol_a,
+            symbol_b,
+            price_diff_pct,
+            net_profit,
+            "" if gas_cost_estimated else " before gas",
+            profitable,
+        )
 
         opportunity = {
             "type": "arbitrage",
@@ -176,6 +374,7 @@ class VibeAgent:
             "flash_loan_amount": flash_loan_amount,
             "gas_estimate": gas_estimate,
             "gas_cost_usd": gas_cost_usd,
+            "gas_cost_estimated": gas_cost_estimated,
             "profitable": profitable,
             "strategy": None,
         }
@@ -183,67 +382,105 @@ class VibeAgent:
         return opportunity
 
     def analyze_liquidation_opportunity(
-        self, protocol: str, account: Optional[str] = None
+        self, protocol: str, account: Optional[str] = None, accounts: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Analyze liquidation opportunities in lending protocols
 
+        Account data is fetched through Multicall3, up to
+        LIQUIDATION_ACCOUNTS_PER_MULTICALL accounts per call, so scanning
+        thousands of accounts takes a handful of eth_calls.
+
         Args:
             protocol: Lending protocol name (e.g., 'aave', 'compound')
             account: Optional specific account to check
+            accounts: Optional list of accounts to check
 
         Returns:
             List of liquidation opportunities
         """
         opportunities = []
 
-        print(f"Scanning {protocol} for liquidation opportunities...")
+        logger.debug("Scanning %s for liquidation opportunities...", protocol)
 
         # Currently only supports Aave V3
         if protocol not in ["aave", "aave_v3"]:
-            print(f"Protocol {protocol} not yet supported. Only 'aave' is currently supported.")
+            logger.warning(
+                "Protocol %s not yet supported. Only 'aave' is currently supported.", protocol
+            )
             return opportunities
 
         try:
-            pool_address = CONTRACT_ADDRESSES[self.network]["aave_v3_pool"]
-            pool = self.web3.eth.contract(address=pool_address, abi=AAVE_V3_POOL_ABI)
-
-            if account:
-                # Check specific account
-                account = Web3.to_checksum_address(account)
-                opportunity = self._check_account_liquidation(pool, account, protocol)
-                if opportunity:
-                    opportunities.append(opportunity)
+            to_check = ([account] if account else []) + list(accounts or [])
+            if to_check:
+                # Check specific accounts, fetching their data in multicall chunks
+                to_check = list(map(_to_checksum_address, to_check))
+                for addr, account_data in zip(to_check, self._fetch_account_data(to_check)):
+                    if account_data is None:
+                        continue
+                    opportunity = self._check_account_liquidation(addr, account_data, protocol)
+                    if opportunity:
+                        opportunities.append(opportunity)
             else:
                 # Note: In production, you would query a subgraph or event logs
                 # to find accounts with loans. For now, we'll return a message
-                print(
-                    "Note: Scanning all accounts requires event log analysis "
-                    "or subgraph queries."
-                )
-                print(
+                logger.warning(
+                    "Scanning all accounts requires event log analysis or subgraph queries. "
                     "Please provide a specific account address to check, "
                     "or implement event scanning."
                 )
 
         except Exception as e:
-            print(f"Error analyzing liquidations: {e}")
+            logger.error("Error analyzing liquidations: %s", e)
 
         if not opportunities:
-            print("No liquidation opportunities found.")
+            logger.info("No liquidation opportunities found.")
         else:
-            print(f"Found {len(opportunities)} liquidation opportunity(ies)")
+            logger.info("Found %d liquidation opportunity(ies)", len(opportunities))
 
         return opportunities
 
+    def _fetch_account_data(self, accounts: List[str]) -> List[Optional[tuple]]:
+        """
+        Fetch Aave account data for many accounts through Multicall3
+
+        Returns:
+            getUserAccountData tuples in the order of accounts (None for failures)
+        """
+        pool_address = self._aave_pool.address
+        chunks = [
+            accounts[start : start + LIQUIDATION_ACCOUNTS_PER_MULTICALL]
+            for start in range(0, len(accounts), LIQUIDATION_ACCOUNTS_PER_MULTICALL)
+        ]
+        calls = [
+            self._multicall.functions.aggregate3(
+                [
+                    (
+                        pool_address,
+                        True,
+                        AAVE_USER_ACCOUNT_DATA_SELECTOR + abi_encode(["address"], [addr]),
+                    )
+                    for addr in chunk
+                ]
+            )
+            for chunk in chunks
+        ]
+
+        account_data = []
+        for chunk, result in zip(chunks, self._batch_call(calls)):
+            if result is None:
+                account_data.extend([None] * len(chunk))
+                continue
+            for success, data in result:
+                ok = success and data
+                account_data.append(abi_decode(AAVE_USER_ACCOUNT_DATA_TYPES, data) if ok else None)
+        return account_data
+
     def _check_account_liquidation(
-        self, pool_contract, account: str, protocol: str
+        self, account: str, account_data: tuple, protocol: str
     ) -> Optional[Dict[str, Any]]:
-        """Check if a specific account can be liquidated"""
+        """Check if a specific account can be liquidated from its Aave account data"""
         try:
-            # Get user account data from Aave
-            account_data = pool_contract.functions.getUserAccountData(account).call()
-
             total_collateral = account_data[0]
             total_debt = account_data[1]
             health_factor = account_data[5]
@@ -251,12 +488,14 @@ class VibeAgent:
             # Health factor is in 18 decimals, < 1e18 means liquidatable
             health_factor_float = health_factor / (10**18)
 
-            print(f"Account: {account}")
-            print(
-                f"Total Collateral: ${total_collateral / (10 ** 8):.2f}"
-            )  # Aave uses 8 decimals for USD
-            print(f"Total Debt: ${total_debt / (10 ** 8):.2f}")
-            print(f"Health Factor: {health_factor_float:.4f}")
+            # Aave uses 8 decimals for USD
+            logger.debug(
+                "Account %s: collateral $%.2f, debt $%.2f, health factor %.4f",
+                account,
+                total_collateral / (10**8),
+                total_debt / (10**8),
+                health_factor_float,
+            )
 
             # Can liquidate if health factor < 1.0
             if health_factor_float < 1.0:
@@ -271,10 +510,14 @@ class VibeAgent:
                 gas_cost_usd = self._estimate_gas_cost(gas_estimate)
                 net_profit = potential_profit - gas_cost_usd
 
-                print("✓ Liquidation opportunity found!")
-                print(f"Potential profit: ${potential_profit:.2f}")
-                print(f"Gas cost: ${gas_cost_usd:.2f}")
-                print(f"Net profit: {net_profit:.2f}")
+                logger.info(
+                    "Liquidation opportunity found for %s: potential profit $%.2f, "
+                    "gas cost $%.2f, net profit $%.2f",
+                    account,
+                    potential_profit,
+                    gas_cost_usd,
+                    net_profit,
+                )
 
                 return {
                     "type": "liquidation",
@@ -296,11 +539,11 @@ class VibeAgent:
                     "strategy": None,
                 }
             else:
-                print("Account is healthy (health factor >= 1.0)")
+                logger.debug("Account is healthy (health factor >= 1.0)")
                 return None
 
         except Exception as e:
-            print(f"Error checking account {account}: {e}")
+            logger.error("Error checking account %s: %s", account, e)
             return None
 
     def generate_strategy_with_ai(self, opportunity: Dict[str, Any]) -> Dict[str, Any]:
@@ -314,17 +557,17 @@ class VibeAgent:
             Enhanced opportunity with AI-generated strategy
         """
         if not self.openai_client:
-            print("OpenAI not configured, using template strategy")
+            logger.info("OpenAI not configured, using template strategy")
             strategy = self._generate_template_strategy(opportunity)
             opportunity["strategy"] = strategy
             return opportunity
 
-        print("Generating AI-powered strategy...")
+        logger.info("Generating AI-powered strategy...")
 
         try:
             # Call OpenAI for strategy insights
             ai_insights = self._call_openai_for_strategy(opportunity)
-            print(f"AI Insights: {ai_insights[:100]}...")
+            logger.info("AI Insights: %.100s...", ai_insights)
 
             # Generate template strategy with AI-enhanced parameters
             strategy = self._generate_template_strategy(opportunity)
@@ -334,7 +577,7 @@ class VibeAgent:
             opportunity["strategy"] = strategy
 
         except Exception as e:
-            print(f"AI generation failed: {e}, using template")
+            logger.warning("AI generation failed: %s, using template", e)
             strategy = self._generate_template_strategy(opportunity)
             opportunity["strategy"] = strategy
 
@@ -472,36 +715,65 @@ class VibeAgent:
         """Add a strategy to the agent's strategy list"""
         self.strategies.append(strategy)
 
+    def _prefetch_token_metadata(
+        self, token_addresses: List[str], fields: tuple = ("decimals", "symbol")
+    ) -> None:
+        """Fetch uncached ERC20 metadata for several tokens in one batched round-trip"""
+        try:
+            keys = []
+            calls = []
+            for address in dict.fromkeys(map(_to_checksum_address, token_addresses)):
+                missing = [field for field in fields if (address, field) not in self._token_cache]
+                if not missing:
+                    continue
+                contract = self.web3.eth.contract(address=address, abi=ERC20_ABI)
+                for field in missing:
+                    keys.append((address, field))
+                    calls.append(getattr(contract.functions, field)())
+
+            if not calls:
+                return
+
+            # Failed lookups stay uncached and fall back to the per-token path
+            for key, result in zip(keys, self._batch_call(calls)):
+                if result is not None:
+                    self._token_cache[key] = result
+        except Exception as e:
+            logger.error("Error prefetching token metadata: %s", e)
+
+    def _erc20_call(self, token_address: str, selector: bytes, output_type: str) -> Any:
+        """Call a no-argument ERC20 view via raw eth_call and decode its return value"""
+        raw = self.web3.eth.call({"to": token_address, "data": selector})
+        return abi_decode([output_type], raw)[0]
+
     def _get_token_decimals(self, token_address: str) -> int:
         """Get token decimals from ERC20 contract"""
-        cache_key = f"{token_address}_decimals"
-        if cache_key in self._token_cache:
-            return self._token_cache[cache_key]
-
         try:
-            token_address = Web3.to_checksum_address(token_address)
-            contract = self.web3.eth.contract(address=token_address, abi=ERC20_ABI)
-            decimals = contract.functions.decimals().call()
+            token_address = _to_checksum_address(token_address)
+            cache_key = (token_address, "decimals")
+            if cache_key in self._token_cache:
+                return self._token_cache[cache_key]
+
+            decimals = self._erc20_call(token_address, ERC20_DECIMALS_SELECTOR, "uint8")
             self._token_cache[cache_key] = decimals
             return decimals
         except Exception as e:
-            print(f"Error getting decimals for {token_address}: {e}")
+            logger.error("Error getting decimals for %s: %s", token_address, e)
             return 18  # Default to 18 decimals
 
     def _get_token_symbol(self, token_address: str) -> str:
         """Get token symbol from ERC20 contract"""
-        cache_key = f"{token_address}_symbol"
-        if cache_key in self._token_cache:
-            return self._token_cache[cache_key]
-
         try:
-            token_address = Web3.to_checksum_address(token_address)
-            contract = self.web3.eth.contract(address=token_address, abi=ERC20_ABI)
-            symbol = contract.functions.symbol().call()
+            token_address = _to_checksum_address(token_address)
+            cache_key = (token_address, "symbol")
+            if cache_key in self._token_cache:
+                return self._token_cache[cache_key]
+
+            symbol = self._erc20_call(token_address, ERC20_SYMBOL_SELECTOR, "string")
             self._token_cache[cache_key] = symbol
             return symbol
         except Exception as e:
-            print(f"Error getting symbol for {token_address}: {e}")
+            logger.error("Error getting symbol for %s: %s", token_address, e)
             return "UNKNOWN"
 
     def _get_dex_price(self, token_a: str, token_b: str, dex: str) -> Optional[float]:
@@ -516,153 +788,465 @@ class VibeAgent:
         Returns:
             Price as float (token_b per token_a) or None if error
         """
-        try:
-            token_a = Web3.to_checksum_address(token_a)
-            token_b = Web3.to_checksum_address(token_b)
-
-            # Check price cache first
-            cache_key = f"{dex}_{token_a}_{token_b}"
-            if cache_key in self._price_cache:
-                cached_price, cached_time = self._price_cache[cache_key]
-                # Check if cache is still valid (within TTL)
-                if time.time() - cached_time < self._price_cache_ttl:
-                    return cached_price
-
-            # Get token decimals (these are already cached)
-            decimals_a = self._get_token_decimals(token_a)
-            decimals_b = self._get_token_decimals(token_b)
-
-            # Use 1 token as test amount
-            amount_in = 10**decimals_a
-
-            price = None
-            if dex == "uniswap_v3":
-                price = self._get_uniswap_v3_price(
-                    token_a, token_b, amount_in, decimals_a, decimals_b
-                )
-            elif dex == "sushiswap":
-                price = self._get_sushiswap_price(
-                    token_a, token_b, amount_in, decimals_a, decimals_b
-                )
-            else:
-                print(f"Unknown DEX: {dex}")
-                return None
+        return self._get_dex_prices(token_a, token_b, [dex]).get(dex)
 
-            # Cache the price if successfully fetched
-            if price is not None:
-                self._price_cache[cache_key] = (price, time.time())
+    def _get_dex_prices(self, token_a: str, token_b: str, dexes: List[str]) -> Dict[str, float]:
+        """
+        Get price quotes from several DEXes in a single batched RPC round-trip
 
-            return price
+        Cached prices are returned directly; quote calls for the remaining DEXes
+        are built up front and submitted together via _batch_call. With
+        price_cache_stale_ok, expired prices are returned as-is and refreshed
+        in the background instead of blocking on the RPC.
 
-        except Exception as e:
-            print(f"Error getting price from {dex}: {e}")
-            return None
+        Args:
+            token_a: Input token address
+            token_b: Output token address
+            dexes: DEX names (uniswap_v3, sushiswap)
 
-    def _get_uniswap_v3_price(
-        self, token_a: str, token_b: str, amount_in: int, decimals_a: int, decimals_b: int
-    ) -> Optional[float]:
-        """Get price from Uniswap V3 Quoter"""
+        Returns:
+            Dictionary of DEX name to price (token_b per token_a), in the order of
+            dexes. DEXes that could not be quoted are omitted.
+        """
+        prices = {}
         try:
-            quoter_address = CONTRACT_ADDRESSES[self.network]["uniswap_v3_quoter"]
-            quoter = self.web3.eth.contract(address=quoter_address, abi=UNISWAP_V3_QUOTER_ABI)
+            token_a = _to_checksum_address(token_a)
+            token_b = _to_checksum_address(token_b)
+
+            # Serve what we can from the price cache
+            pending = []
+            stale = []
+            now = time.monotonic_ns()
+            for dex in dexes:
+                cache_key = (dex, token_a, token_b)
+                entry = self._price_cache.get(cache_key)
+                if entry is not None:
+                    price, deadline, refreshing = entry
+                    # Entries store their expiry on the monotonic clock
+                    if deadline > now:
+                        prices[dex] = price
+                        continue
+                    if self._refresh_executor is not None:
+                        prices[dex] = price
+                        if not refreshing and self._claim_refresh(cache_key):
+                            stale.append(dex)
+                        continue
+
+                if dex not in self._quote_contracts:
+                    logger.warning("Unknown DEX: %s", dex)
+                    continue
+                pending.append(dex)
+
+            if stale:
+                self._refresh_executor.submit(self._fetch_dex_prices, token_a, token_b, stale)
+            if pending:
+                prices.update(self._fetch_dex_prices(token_a, token_b, pending))
+
+        except Exception as e:
+            logger.error("Error getting prices from %s: %s", dexes, e)
+
+        return {dex: prices[dex] for dex in dexes if dex in prices}
 
-            # Try 0.3% fee tier (most common)
-            fee = 3000
-            amount_out = quoter.functions.quoteExactInputSingle(
-                token_a, token_b, fee, amount_in, 0
-            ).call()
+    def _claim_refresh(self, cache_key: tuple) -> bool:
+        """Flag an expired price as refreshing; False if another caller already has"""
+        with self._refresh_lock:
+            price, deadline, refreshing = self._price_cache[cache_key]
+            if refreshing:
+                return False
+            self._price_cache[cache_key] = (price, deadline, True)
+            return True
 
-            # Convert to float price
-            price = (amount_out / (10**decimals_b)) / (amount_in / (10**decimals_a))
-            return price
+    def prefetch_dex_prices(self, token_pairs: List[tuple], dexes: List[str]) -> None:
+        """
+        Warm the price cache for many token pairs in shared batched round-trips
+
+        Every uncached (dex, pair) quote goes into the same JSON-RPC batches, so
+        a scan over N pairs costs about one round-trip per rpc_batch_size quotes
+        instead of one per pair. Later _get_dex_prices calls are cache hits.
 
+        Args:
+            token_pairs: (token_a, token_b) address tuples
+            dexes: DEX names (uniswap_v3, sushiswap)
+        """
+        try:
+            self._prefetch_token_metadata([token for pair in token_pairs for token in pair])
+
+            now = time.monotonic_ns()
+            keys = []
+            for token_a, token_b in token_pairs:
+                token_a = _to_checksum_address(token_a)
+                token_b = _to_checksum_address(token_b)
+                for dex in dexes:
+                    if dex not in self._quote_contracts:
+                        continue
+                    entry = self._price_cache.get((dex, token_a, token_b))
+                    if entry is None or entry[1] <= now:
+                        keys.append((dex, token_a, token_b))
+
+            if keys:
+                self._fetch_quotes(keys)
         except Exception as e:
-            print(f"Error querying Uniswap V3: {e}")
-            return None
+            logger.error("Error prefetching prices: %s", e)
+
+    def _fetch_dex_prices(self, token_a: str, token_b: str, dexes: List[str]) -> Dict[str, float]:
+        """Quote checksummed token_a/token_b on dexes in one batch and cache the prices"""
+        quotes = self._fetch_quotes([(dex, token_a, token_b) for dex in dexes])
+        return {
+            dex: quotes[(dex, token_a, token_b)]
+            for dex in dexes
+            if (dex, token_a, token_b) in quotes
+        }
+
+    def _fetch_quotes(self, keys: List[tuple]) -> Dict[tuple, float]:
+        """
+        Quote (dex, token_a, token_b) keys in Multicall3 calls and cache the prices
+
+        Probes for many keys are packed into each aggregate3 call (up to
+        QUOTE_PROBES_PER_MULTICALL), so a typical scan is priced by a single
+        eth_call and every quote in it comes from the same block.
+
+        Token addresses must already be checksummed.
+
+        Returns:
+            Dictionary of key to price for the quotes that succeeded
+        """
+        prices = {}
+        if not keys:
+            return prices
 
-    def _get_sushiswap_price(
-        self, token_a: str, token_b: str, amount_in: int, decimals_a: int, decimals_b: int
-    ) -> Optional[float]:
-        """Get price from SushiSwap Router"""
         try:
-            router_address = CONTRACT_ADDRESSES[self.network]["sushiswap_router"]
-            router = self.web3.eth.contract(address=router_address, abi=SUSHISWAP_ROUTER_ABI)
+            # Group keys so that no multicall exceeds the probe limit
+            groups = [[]]
+            group_probes = [[]]
+            out_scales = {}
+            for key in keys:
+                dex, token_a, token_b = key
+                # Get token decimals (these are already cached)
+                decimals_a = self._get_token_decimals(token_a)
+                decimals_b = self._get_token_decimals(token_b)
+
+                # Use 1 token as test amount, so the price is just amount_out in token_b units
+                probes = self._build_quote_probes(dex, token_a, token_b, POW10[decimals_a])
+                out_scales[key] = (POW10[decimals_b], len(probes))
+                if len(group_probes[-1]) + len(probes) > QUOTE_PROBES_PER_MULTICALL:
+                    groups.append([])
+                    group_probes.append([])
+                groups[-1].append(key)
+                group_probes[-1].extend(probes)
+
+            calls = [self._multicall.functions.aggregate3(probes) for probes in group_probes]
+            results = self._batch_call(calls)
+
+            deadline = time.monotonic_ns() + self._price_ttl_ns
+            for group, result in zip(groups, results):
+                if result is None:
+                    continue
+                offset = 0
+                for key in group:
+                    out_scale, probe_count = out_scales[key]
+                    amount_out = self._decode_quote(key[0], result[offset : offset + probe_count])
+                    offset += probe_count
+                    if amount_out is None:
+                        continue
+                    price = amount_out / out_scale
+                    prices[key] = price
+                    self._price_cache[key] = (price, deadline, False)
+        finally:
+            # Let a later lookup retry quotes that failed to refresh
+            for key in keys:
+                entry = self._price_cache.get(key)
+                if key not in prices and entry is not None and entry[2]:
+                    self._price_cache[key] = (entry[0], entry[1], False)
+
+        return prices
+
+    def _build_quote_probes(
+        self, dex: str, token_a: str, token_b: str, amount_in: int
+    ) -> List[tuple]:
+        """
+        Build the Multicall3 Call3 probes quoting amount_in of token_a on a DEX
 
-            # Get amounts out
-            amounts = router.functions.getAmountsOut(amount_in, [token_a, token_b]).call()
-            amount_out = amounts[1]
+        Probes allow failure, so a missing pool reverts inside the multicall
+        instead of failing the other quotes sent with it.
+        """
+        target = self._quote_contracts[dex].address
+        if dex == DEX_UNISWAP_V3:
+            # Probe every fee tier; the best one is picked when decoding
+            probes = [
+                (
+                    target,
+                    True,
+                    UNISWAP_V3_QUOTE_SELECTOR
+                    + abi_encode(
+                        ["address", "address", "uint24", "uint256", "uint160"],
+                        [token_a, token_b, fee, amount_in, 0],
+                    ),
+                )
+                for fee in UNISWAP_V3_FEE_TIERS
+            ]
+        else:
+            probes = [
+                (
+                    target,
+                    True,
+                    SUSHISWAP_AMOUNTS_OUT_SELECTOR
+                    + abi_encode(["uint256", "address[]"], [amount_in, [token_a, token_b]]),
+                )
+            ]
+        return probes
+
+    def _decode_quote(self, dex: str, result: List[tuple]) -> Optional[int]:
+        """Best amount out among the successful probes of an aggregate3 quote"""
+        amounts = []
+        for success, data in result:
+            # Calls to an address without code succeed with no return data
+            if not success or not data:
+                continue
+            if dex == DEX_SUSHISWAP:
+                # getAmountsOut returns the amounts along the path
+                amounts.append(abi_decode(["uint256[]"], data)[0][-1])
+            else:
+                amounts.append(abi_decode(["uint256"], data)[0])
+        return max(amounts, default=None)
 
-            # Convert to float price
-            price = (amount_out / (10**decimals_b)) / (amount_in / (10**decimals_a))
-            return price
+    def _batch_call(self, calls: List[Any]) -> List[Optional[Any]]:
+        """
+        Execute contract calls as JSON-RPC batches of at most rpc_batch_size requests
 
-        except Exception as e:
-            print(f"Error querying SushiSwap: {e}")
-            return None
+        When the calls span several batches, up to rpc_concurrency batches are
+        in flight at once, so a large scan waits about one round-trip per
+        rpc_concurrency batches rather than one per batch.
+
+        Args:
+            calls: Unsent contract function calls
+
+        Returns:
+            Decoded results in the same order as calls (None for failed calls)
+        """
+        chunks = [
+            calls[start : start + self.rpc_batch_size]
+            for start in range(0, len(calls), self.rpc_batch_size)
+        ]
+        if len(chunks) <= 1 or self._rpc_executor is None:
+            parts = map(self._call_batch, chunks)
+        else:
+            parts = self._rpc_executor.map(self._call_batch, chunks)
+
+        results = []
+        for part in parts:
+            results.extend(part)
+        return results
+
+    def _call_batch(self, chunk: List[Any]) -> List[Optional[Any]]:
+        """
+        Execute one JSON-RPC batch of contract calls
+
+        If the provider rejects the batch (or web3 does not support batching),
+        the calls are sent individually so one failing quote does not discard
+        the others.
+        """
+        # A batch of one buys nothing over a plain eth_call
+        if len(chunk) > 1 and self._rpc_batching:
+            try:
+                with self.web3.batch_requests() as batch:
+                    for call in chunk:
+                        batch.add(call)
+                    return list(batch.execute())
+            except Exception as e:
+                logger.warning("Batch RPC request failed: %s, retrying calls individually", e)
+
+        results = []
+        for call in chunk:
+            try:
+                results.append(call.call())
+            except Exception as e:
+                logger.error("Error calling %s: %s", call.fn_name, e)
+                results.append(None)
+        return results
 
     def _get_eth_price_usd(self) -> float:
         """
-        Get current ETH price in USD from WETH/USDC pair on DEX
+        Get current ETH price in USD from Chainlink, or the WETH/USDC pair on DEX
+
+        Successful lookups are memoized for the price cache TTL, so repeated
+        gas estimates within a scan skip the RPC entirely. The price is picked
+        with the following fallback chain:
+        1. Chainlink ETH/USD feed (a single eth_call)
+        2. Uniswap V3 WETH/USDC pair
+        3. SushiSwap WETH/USDC pair
+        4. Hardcoded 2000 USD (conservative estimate)
 
-        Fetches price with the following fallback chain:
-        1. Uniswap V3 WETH/USDC pair
-        2. SushiSwap WETH/USDC pair
-        3. Hardcoded 2000 USD (conservative estimate)
+        Both DEXes are quoted in a single batched request. With
+        price_cache_stale_ok, an expired price is returned at once and refreshed
+        in the background.
 
         Returns:
             ETH price in USD, or 2000 as fallback if unable to fetch
         """
+        entry = self._price_cache.get(ETH_USD_PRICE_KEY)
+        if entry is not None:
+            price, deadline, refreshing = entry
+            if deadline > time.monotonic_ns():
+                return price
+            if self._refresh_executor is not None:
+                if not refreshing and self._claim_refresh(ETH_USD_PRICE_KEY):
+                    self._refresh_executor.submit(self._fetch_eth_price_usd)
+                return price
+
+        return self._fetch_eth_price_usd()
+
+    def _fetch_eth_price_usd(self) -> float:
+        """Look up ETH/USD through the fallback chain and cache it"""
+        price = None
         try:
             # Get WETH and USDC addresses for the current network
             if self.network not in COMMON_TOKENS:
-                print(f"Network {self.network} not supported for price fetching, using fallback")
-                return 2000.0
+                logger.warning(
+                    "Network %s not supported for price fetching, using fallback", self.network
+                )
+            else:
+                price = self._get_chainlink_eth_price()
+                if price is None:
+                    weth_address = COMMON_TOKENS[self.network]["WETH"]
+                    usdc_address = COMMON_TOKENS[self.network]["USDC"]
+
+                    # Quote both DEXes at once, preferring Uniswap V3 over SushiSwap
+                    # Returns USDC per WETH (since USDC ≈ USD, this gives us ETH price in USD)
+                    prices = self._get_dex_prices(
+                        weth_address, usdc_address, [DEX_UNISWAP_V3, DEX_SUSHISWAP]
+                    )
+                    price = prices.get(DEX_UNISWAP_V3)
+                    if price is None:
+                        price = prices.get(DEX_SUSHISWAP)
+
+                # If still no price, use conservative fallback
+                if price is None:
+                    logger.warning(
+                        "Unable to fetch ETH price from DEX, using fallback value of 2000"
+                    )
+        except Exception as e:
+            logger.error("Error fetching ETH price: %s, using fallback value of 2000", e)
 
-            weth_address = COMMON_TOKENS[self.network]["WETH"]
-            usdc_address = COMMON_TOKENS[self.network]["USDC"]
+        if price is None:
+            # The fallback is not cached; let a later lookup retry the refresh
+            entry = self._price_cache.get(ETH_USD_PRICE_KEY)
+            if entry is not None:
+                self._price_cache[ETH_USD_PRICE_KEY] = (entry[0], entry[1], False)
+            return ETH_PRICE_FALLBACK_USD
 
-            # Try to get price from Uniswap V3 first
-            # Returns USDC per WETH (since USDC ≈ USD, this gives us ETH price in USD)
-            price = self._get_dex_price(weth_address, usdc_address, DEX_UNISWAP_V3)
+        deadline = time.monotonic_ns() + self._price_ttl_ns
+        self._price_cache[ETH_USD_PRICE_KEY] = (price, deadline, False)
+        return price
 
-            # If that fails, try SushiSwap
-            if price is None:
-                price = self._get_dex_price(weth_address, usdc_address, DEX_SUSHISWAP)
+    def _get_chainlink_eth_price(self) -> Optional[float]:
+        """ETH/USD from the network's Chainlink feed, or None if unavailable or stale"""
+        try:
+            raw = self.web3.eth.call(
+                {
+                    "to": CONTRACT_ADDRESSES[self.network]["chainlink_eth_usd"],
+                    "data": CHAINLINK_LATEST_ROUND_DATA_SELECTOR,
+                }
+            )
+            _, answer, _, updated_at, _ = abi_decode(CHAINLINK_ROUND_DATA_TYPES, raw)
+        except Exception as e:
+            logger.warning("Error reading Chainlink ETH/USD feed: %s", e)
+            return None
 
-            # If still no price, use conservative fallback
-            if price is None:
-                print("Unable to fetch ETH price from DEX, using fallback value of 2000")
-                return 2000.0
+        if answer <= 0 or time.time() - updated_at > CHAINLINK_MAX_AGE_SECONDS:
+            return None
+        return answer / POW10[CHAINLINK_ANSWER_DECIMALS]
 
-            return price
+    def _get_gas_price(self) -> int:
+        """
+        Get current gas price in wei, reused for about one block
 
-        except Exception as e:
-            print(f"Error fetching ETH price: {e}, using fallback value of 2000")
-            return 2000.0
+        With price_cache_stale_ok, an expired gas price is returned at once and
+        refreshed in the background, so gas estimates in a long-running scan
+        only wait on the RPC for the very first lookup.
+        """
+        entry = self._gas_price_cache
+        if entry is not None:
+            gas_price, deadline, refreshing = entry
+            if deadline > time.monotonic_ns():
+                return gas_price
+            if self._refresh_executor is not None:
+                if not refreshing and self._claim_gas_price_refresh():
+                    self._refresh_executor.submit(self._fetch_gas_price)
+                return gas_price
+
+        return self._fetch_gas_price()
+
+    def _claim_gas_price_refresh(self) -> bool:
+        """Flag the expired gas price as refreshing; False if another caller already has"""
+        with self._refresh_lock:
+            gas_price, deadline, refreshing = self._gas_price_cache
+            if refreshing:
+                return False
+            self._gas_price_cache = (gas_price, deadline, True)
+            return True
+
+    def _fetch_gas_price(self) -> int:
+        """Fetch the gas price from the node and cache it"""
+        try:
+            gas_price = self.web3.eth.gas_price
+        except Exception:
+            # Let a later lookup retry the refresh
+            entry = self._gas_price_cache
+            if entry is not None:
+                self._gas_price_cache = (entry[0], entry[1], False)
+            raise
+
+        deadline = time.monotonic_ns() + GAS_PRICE_CACHE_TTL * 10**9
+        self._gas_price_cache = (gas_price, deadline, False)
+        return gas_price
 
     def _estimate_gas_cost(self, gas_units: int = 500000) -> int:
         """Estimate gas cost in USD"""
         try:
-            # Get current gas price
-            gas_price = self.web3.eth.gas_price
+            # Get current gas price (cached per block)
+            gas_price = self._get_gas_price()
             # Estimate ETH cost
             eth_cost = (gas_price * gas_units) / (10**18)
             # Get real-time ETH price from DEX
             eth_price_usd = self._get_eth_price_usd()
             return int(eth_cost * eth_price_usd)
         except Exception as e:
-            print(f"Error estimating gas cost: {e}")
+            logger.error("Error estimating gas cost: %s", e)
             return 50  # Default conservative estimate
 
+    def _cached_gas_cost_usd(self, gas_units: int) -> Optional[int]:
+        """Gas cost in USD from cached (possibly stale) gas and ETH prices, or None; no RPC"""
+        gas_entry = self._gas_price_cache
+        eth_entry = self._price_cache.get(ETH_USD_PRICE_KEY)
+        if gas_entry is None or eth_entry is None:
+            return None
+        eth_cost = (gas_entry[0] * gas_units) / (10**18)
+        return int(eth_cost * eth_entry[0])
+
     def _call_openai_for_strategy(self, opportunity: Dict[str, Any]) -> str:
-        """Call OpenAI API for strategy generation with fallback"""
+        """
+        Call OpenAI API for strategy generation with fallback
+
+        Insights are cached per opportunity shape (type, DEXes, tokens) for
+        AI_INSIGHTS_CACHE_TTL seconds, so a recurring opportunity does not
+        block on another completion.
+        """
         if not self.openai_client:
             return "Using template strategy (OpenAI not configured)"
 
+        cache_key = json.dumps(
+            {field: opportunity.get(field) for field in AI_INSIGHTS_KEY_FIELDS},
+            sort_keys=True,
+            default=str,
+        )
+        entry = self._ai_insights_cache.get(cache_key)
+        if entry is not None and entry[1] > time.monotonic_ns():
+            return entry[0]
+
         try:
             prompt = self._create_strategy_prompt(opportunity)
-            response = openai.chat.completions.create(
-                model="gpt-4",
+            response = self.openai_client.chat.completions.create(
+                model=self.openai_model,
                 messages=[
                     {"role": "system", "content": "You are a DeFi strategy expert."},
                     {"role": "user", "content": prompt},
@@ -670,7 +1254,12 @@ class VibeAgent:
                 max_tokens=500,
                 temperature=0.7,
             )
-            return response.choices[0].message.content
+            insights = response.choices[0].message.content
+            self._ai_insights_cache[cache_key] = (
+                insights,
+                time.monotonic_ns() + AI_INSIGHTS_CACHE_TTL * 10**9,
+            )
+            return insights
         except Exception as e:
-            print(f"OpenAI API error: {e}")
+            logger.error("OpenAI API error: %s", e)
             return "Using template strategy (API call failed)"
@@ -4,9 +4,11 @@ Autonomous scanner for continuous monitoring of arbitrage opportunities
 
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
 from datetime import datetime
 from collections import deque
+from itertools import islice
 
 from .agent import VibeAgent
 from .config import AgentConfig
@@ -27,7 +29,11 @@ class AutonomousScanner:
         self.agents = {}
         for network in config.networks:
             try:
-                self.agents[network] = VibeAgent(network=network)
+                self.agents[network] = VibeAgent(
+                    network=network,
+                    rpc_batch_size=config.rpc_batch_size,
+                    rpc_concurrency=config.rpc_concurrency,
+                )
                 self.logger.info(f"Initialized agent for {network}")
             except Exception as e:
                 self.logger.error(f"Failed to initialize agent for {network}: {e}")
@@ -47,7 +53,8 @@ class AutonomousScanner:
         self.max_opportunities_history = 100
         self.opportunities = deque(maxlen=self.max_opportunities_history)
 
-        # Scanner statistics
+        # Scanner statistics (networks are scanned concurrently, so guard updates)
+        self._stats_lock = threading.Lock()
         self.stats = {
             "total_scans": 0,
             "opportunities_found": 0,
@@ -93,19 +100,31 @@ class AutonomousScanner:
 
             except Exception as e:
                 self.logger.error(f"Error in scan loop: {e}")
-                self.stats["errors"] += 1
+                with self._stats_lock:
+                    self.stats["errors"] += 1
                 time.sleep(10)  # Wait before retrying
 
     def _perform_scan(self):
-        """Perform a single scan cycle across all networks"""
-        self.stats["total_scans"] += 1
-        self.stats["last_scan"] = datetime.now().isoformat()
+        """Perform a single scan cycle across all networks concurrently"""
+        with self._stats_lock:
+            self.stats["total_scans"] += 1
+            self.stats["last_scan"] = datetime.now().isoformat()
 
-        for network in self.config.networks:
-            try:
-                self._scan_network(network)
-            except Exception as e:
-                self.logger.error(f"Error scanning {network}: {e}")
+        networks = self.config.networks
+        if not networks:
+            return
+
+        # Scans are bound by RPC latency, so overlap the networks' round-trips
+        with ThreadPoolExecutor(max_workers=len(networks), thread_name_prefix="scan") as pool:
+            list(pool.map(self._scan_network_safely, networks))
+
+    def _scan_network_safely(self, network: str):
+        """Scan a network, recording any error instead of raising"""
+        try:
+            self._scan_network(network)
+        except Exception as e:
+            self.logger.error(f"Error scanning {network}: {e}")
+            with self._stats_lock:
                 self.stats["errors"] += 1
 
     def _scan_network(self, network: str):
@@ -122,13 +141,20 @@ class AutonomousScanner:
 
         self.logger.log_scan_start(network, len(self.config.monitored_token_pairs))
 
+        # Skip blacklisted tokens
+        token_pairs = [
+            token_pair
+            for token_pair in self.config.monitored_token_pairs
+            if not self.config.any_blacklisted(token_pair)
+        ]
+
+        # Quote every pair up front in shared RPC batches; the analysis below
+        # then reads prices from the agent's cache
+        agent.prefetch_dex_prices(token_pairs, self.config.enabled_dexes)
+
         # Scan all monitored token pairs
-        for token_pair in self.config.monitored_token_pairs:
+        for token_pair in token_pairs:
             try:
-                # Skip blacklisted tokens
-                if any(self.config.is_address_blacklisted(token) for token in token_pair):
-                    continue
-
                 # Analyze arbitrage opportunity
                 opportunity = agent.analyze_arbitrage_opportunity(
                     token_pair=token_pair, dexes=self.config.enabled_dexes
@@ -137,7 +163,8 @@ class AutonomousScanner:
                 # Check if profitable
                 if opportunity.get("profitable", False):
                     self.logger.log_opportunity_found(opportunity)
-                    self.stats["opportunities_found"] += 1
+                    with self._stats_lock:
+                        self.stats["opportunities_found"] += 1
 
                     # Generate strategy (skip AI generation in autonomous mode for performance)
                     # AI generation is expensive (5-30s per call) and blocks the scan loop
@@ -155,9 +182,10 @@ class AutonomousScanner:
                     if self.config.autonomous_mode:
                         success = execution_engine.execute_opportunity(opportunity)
                         if success:
-                            self.stats["opportunities_executed"] += 1
                             profit = opportunity.get("estimated_profit_usd", 0)
-                            self.stats["total_profit_usd"] += profit
+                            with self._stats_lock:
+                                self.stats["opportunities_executed"] += 1
+                                self.stats["total_profit_usd"] += profit
 
             except Exception as e:
                 self.logger.error(f"Error scanning token pair {token_pair}: {e}")
@@ -168,12 +196,18 @@ class AutonomousScanner:
         self.opportunities.append(opportunity)
 
     def get_opportunities(self, limit: int = 20) -> List[Dict[str, Any]]:
-        """Get recent opportunities"""
-        # Convert deque to list and get last N items
-        return list(self.opportunities)[-limit:]
+        """Get recent opportunities (oldest first)"""
+        # Walk back from the newest entry so only the last N items are copied
+        recent = list(islice(reversed(self.opportunities), max(limit, 0)))
+        recent.reverse()
+        return recent
 
     def get_status(self) -> Dict[str, Any]:
         """Get scanner status"""
+        # Snapshot the stats so callers never see them change mid-read
+        with self._stats_lock:
+            stats = dict(self.stats)
+
         return {
             "is_running": self.is_running,
             "last_scan": self.last_scan_time.isoformat() if self.last_scan_time else None,
@@ -181,7 +215,7 @@ class AutonomousScanner:
             "networks": self.config.networks,
             "monitored_pairs": len(self.config.monitored_token_pairs),
             "enabled_dexes": self.config.enabled_dexes,
-            "stats": self.stats,
+            "stats": stats,
             "config": {
                 "autonomous_mode": self.config.autonomous_mode,
                 "require_manual_approval": self.config.require_manual_approval,
@@ -3,9 +3,12 @@ Instadapp Avocado Multi-Sig Wallet Integration
 Converts strategies into Avocado-compatible transaction batches
 """
 
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional
 from web3 import Web3
 import json
+import logging
+import time
 from datetime import datetime
 from .contract_abis import (
     UNISWAP_V3_ROUTER_ABI,
@@ -14,6 +17,8 @@ from .contract_abis import (
     CONTRACT_ADDRESSES,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class AvocadoIntegration:
     """
@@ -61,6 +66,21 @@ class AvocadoIntegration:
         },
     }
 
+    # Chain IDs per network
+    CHAIN_IDS = {"ethereum": 1, "polygon": 137, "arbitrum": 42161}
+
+    # Rough gas estimates per strategy action type
+    ACTION_GAS_ESTIMATES = {
+        "flash_loan": 150000,
+        "swap": 100000,
+        "liquidate": 200000,
+        "repay_flash_loan": 50000,
+    }
+
+    # Encoded swaps carry a deadline of now + 300s, so encodings are only reused briefly
+    TX_CACHE_TTL = 60
+    TX_CACHE_SIZE = 256
+
     def __init__(self, wallet_address: str, network: str = "ethereum"):
         """
         Initialize Avocado integration
@@ -73,6 +93,34 @@ class AvocadoIntegration:
         self.network = network
         self.web3 = Web3()  # Utility instance for encoding
 
+        # Step action -> action builder. repay_flash_loan has no builder since
+        # repayment is handled in the flash loan callback.
+        self._action_builders = {
+            "flash_loan": self._build_flash_loan_action,
+            "swap": self._build_swap_action,
+            "liquidate": self._build_liquidation_action,
+        }
+
+        # (network, wallet, canonical steps JSON) -> (expires_at, actions), least recent first
+        self._tx_cache = OrderedDict()
+
+        # Contracts used for calldata encoding, bound once per network
+        self._contracts = self._build_contracts()
+
+    def _build_contracts(self) -> Dict[str, Any]:
+        """Bind the Aave pool and DEX routers for this network, keyed by CONTRACT_ADDRESSES name"""
+        abis = {
+            "aave_v3_pool": AAVE_V3_POOL_ABI,
+            "uniswap_v3_router": UNISWAP_V3_ROUTER_ABI,
+            "sushiswap_router": SUSHISWAP_ROUTER_ABI,
+        }
+        addresses = CONTRACT_ADDRESSES.get(self.network, {})
+        return {
+            name: self.web3.eth.contract(address=addresses[name], abi=abi)
+            for name, abi in abis.items()
+            if name in addresses
+        }
+
     def strategy_to_avocado_transactions(self, strategy: Dict[str, Any]) -> Dict[str, Any]:
         """
         Convert a VibeAgent strategy into Avocado transaction builder format
@@ -83,13 +131,7 @@ class AvocadoIntegration:
         Returns:
             Avocado-compatible transaction batch
         """
-        steps = strategy.get("steps", [])
-        actions = []
-
-        for step in steps:
-            action = self._convert_step_to_action(step)
-            if action:
-                actions.append(action)
+        actions = self._get_actions(strategy.get("steps", []))
 
         # Build the transaction batch for Avocado
         return {
@@ -103,21 +145,31 @@ class AvocadoIntegration:
             "transactions": actions,
         }
 
+    def _get_actions(self, steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert strategy steps to actions, reusing recent encodings of identical steps"""
+        # Calldata depends on the network's contracts and the wallet, not just the steps
+        key = (self.network, self.wallet_address, json.dumps(steps, sort_keys=True, default=str))
+        now = time.monotonic()
+        entry = self._tx_cache.get(key)
+        if entry is not None and entry[0] > now:
+            actions = entry[1]
+        else:
+            actions = [action for action in map(self._convert_step_to_action, steps) if action]
+            if key not in self._tx_cache and len(self._tx_cache) >= self.TX_CACHE_SIZE:
+                # Evict the least recently used entry
+                self._tx_cache.popitem(last=False)
+            self._tx_cache[key] = (now + self.TX_CACHE_TTL, actions)
+        self._tx_cache.move_to_end(key)
+
+        # Hand out copies so callers cannot alter the cached actions
+        return [{**action, "meta": dict(action["meta"])} for action in actions]
+
     def _convert_step_to_action(self, step: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Convert a strategy step into an Avocado action"""
-        action_type = step.get("action")
-
-        if action_type == "flash_loan":
-            return self._build_flash_loan_action(step)
-        elif action_type == "swap":
-            return self._build_swap_action(step)
-        elif action_type == "liquidate":
-            return self._build_liquidation_action(step)
-        elif action_type == "repay_flash_loan":
-            # Usually handled in the flash loan callback
+        builder = self._action_builders.get(step.get("action"))
+        if builder is None:
             return None
-
-        return None
+        return builder(step)
 
     def _build_flash_loan_action(self, step: Dict[str, Any]) -> Dict[str, Any]:
         """Build flash loan action for Avocado"""
@@ -190,21 +242,17 @@ class AvocadoIntegration:
 
     def _get_chain_id(self, network: str) -> int:
         """Get chain ID for network"""
-        chain_ids = {"ethereum": 1, "polygon": 137, "arbitrum": 42161}
-        return chain_ids.get(network, 1)
+        return self.CHAIN_IDS.get(network, 1)
 
-    def export_for_transaction_builder(
-        self, strategy: Dict[str, Any], filename: Optional[str] = None
-    ) -> str:
+    def build_transaction_batch(self, strategy: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Export strategy as JSON for Avocado transaction builder
+        Build the Avocado transaction builder batch for a strategy
 
         Args:
             strategy: Strategy dict or opportunity dict with 'strategy' key
-            filename: Optional filename to save to
 
         Returns:
-            JSON string of the transaction batch
+            Transaction batch dict with export metadata
         """
         # Handle both opportunity and strategy objects
         if "strategy" in strategy and isinstance(strategy["strategy"], dict):
@@ -226,18 +274,52 @@ class AvocadoIntegration:
         transaction_batch["meta"]["estimated_gas"] = actual_strategy.get("estimated_gas", 0)
         transaction_batch["meta"]["risk_level"] = self._assess_risk_level(actual_strategy)
 
-        json_output = json.dumps(transaction_batch, indent=2)
+        return transaction_batch
+
+    def export_for_transaction_builder(
+        self, strategy: Dict[str, Any], filename: Optional[str] = None
+    ) -> str:
+        """
+        Export strategy as JSON for Avocado transaction builder
+
+        Args:
+            strategy: Strategy dict or opportunity dict with 'strategy' key
+            filename: Optional filename to save to
+
+        Returns:
+            JSON string of the transaction batch
+        """
+        transaction_batch = self.build_transaction_batch(strategy)
 
         if filename:
-            with open(filename, "w") as f:
-                f.write(json_output)
-            print(f"Transaction batch saved to {filename}")
+            return self.save_transaction_batch(transaction_batch, filename)
+
+        return json.dumps(transaction_batch, indent=2)
+
+    def save_transaction_batch(self, transaction_batch: Dict[str, Any], filename: str) -> str:
+        """
+        Write a built transaction batch to a JSON file
+
+        Args:
+            transaction_batch: Batch from build_transaction_batch
+            filename: File to save to
+
+        Returns:
+            JSON string of the transaction batch
+        """
+        json_output = json.dumps(transaction_batch, indent=2)
+        with open(filename, "w") as f:
+            f.write(json_output)
+        logger.info("Transaction batch saved to %s", filename)
 
         return json_output
 
-    def _assess_risk_level(self, strategy: Dict[str, Any]) -> str:
-        """Assess risk level of strategy"""
-        warnings = self._check_strategy_risks(strategy)
+    def _assess_risk_level(
+        self, strategy: Dict[str, Any], warnings: Optional[List[str]] = None
+    ) -> str:
+        """Assess risk level of strategy (pass warnings if already computed)"""
+        if warnings is None:
+            warnings = self._check_strategy_risks(strategy)
 
         if len(warnings) == 0:
             return "low"
@@ -269,7 +351,7 @@ class AvocadoIntegration:
             "estimated_gas": total_gas,
             "gas_with_buffer": gas_with_buffer,
             "estimated_profit_usd": strategy.get("estimated_profit_usd", 0),
-            "risk_level": self._assess_risk_level(strategy),
+            "risk_level": self._assess_risk_level(strategy, warnings),
             "warnings": warnings,
             "steps_count": len(strategy.get("steps", [])),
             "simulation_recommendations": [
@@ -282,20 +364,10 @@ class AvocadoIntegration:
 
     def _estimate_total_gas(self, strategy: Dict[str, Any]) -> int:
         """Estimate total gas for strategy execution"""
-        # Rough estimates per action type
-        gas_estimates = {
-            "flash_loan": 150000,
-            "swap": 100000,
-            "liquidate": 200000,
-            "repay_flash_loan": 50000,
-        }
-
-        total_gas = 0
-        for step in strategy.get("steps", []):
-            action = step.get("action")
-            total_gas += gas_estimates.get(action, 100000)
-
-        return total_gas
+        gas_estimates = self.ACTION_GAS_ESTIMATES
+        return sum(
+            gas_estimates.get(step.get("action"), 100000) for step in strategy.get("steps", [])
+        )
 
     def _check_strategy_risks(self, strategy: Dict[str, Any]) -> List[str]:
         """Check for potential risks in strategy"""
@@ -338,11 +410,7 @@ class AvocadoIntegration:
             else:
                 amount_wei = int(float(amount) * (10**18))
 
-            # Get pool address
-            pool_address = CONTRACT_ADDRESSES[self.network]["aave_v3_pool"]
-
-            # Create contract instance for encoding
-            pool = self.web3.eth.contract(address=pool_address, abi=AAVE_V3_POOL_ABI)
+            pool = self._contracts["aave_v3_pool"]
 
             # Encode flashLoan function call
             # flashLoan(receiverAddress, assets[], amounts[], modes[],
@@ -359,7 +427,7 @@ class AvocadoIntegration:
             return encoded
 
         except Exception as e:
-            print(f"Error encoding flash loan: {e}")
+            logger.error("Error encoding flash loan: %s", e)
             return "0x"
 
     def _encode_swap_call(self, dex: str, from_token: str, to_token: str) -> str:
@@ -379,11 +447,8 @@ class AvocadoIntegration:
             to_token = Web3.to_checksum_address(to_token)
 
             if dex == "uniswap_v3":
-                # Get router address
-                router_address = CONTRACT_ADDRESSES[self.network]["uniswap_v3_router"]
-
                 # Encode Uniswap V3 exactInputSingle
-                router = self.web3.eth.contract(address=router_address, abi=UNISWAP_V3_ROUTER_ABI)
+                router = self._contracts["uniswap_v3_router"]
 
                 # Placeholder values - would be calculated from actual balances
                 encoded = router.functions.exactInputSingle(
@@ -392,7 +457,7 @@ class AvocadoIntegration:
                         to_token,  # tokenOut
                         3000,  # fee (0.3%)
                         self.wallet_address,  # recipient
-                        int(datetime.now().timestamp()) + 300,  # deadline (5 min)
+                        int(time.time()) + 300,  # deadline (5 min)
                         10**18,  # amountIn (placeholder)
                         0,  # amountOutMinimum (would calculate with slippage)
                         0,  # sqrtPriceLimitX96
@@ -401,27 +466,24 @@ class AvocadoIntegration:
                 return encoded
 
             elif dex == "sushiswap":
-                # Get router address
-                router_address = CONTRACT_ADDRESSES[self.network]["sushiswap_router"]
-
                 # Encode SushiSwap swapExactTokensForTokens
-                router = self.web3.eth.contract(address=router_address, abi=SUSHISWAP_ROUTER_ABI)
+                router = self._contracts["sushiswap_router"]
 
                 encoded = router.functions.swapExactTokensForTokens(
                     10**18,  # amountIn (placeholder)
                     0,  # amountOutMin (would calculate with slippage)
                     [from_token, to_token],  # path
                     self.wallet_address,  # to
-                    int(datetime.now().timestamp()) + 300,  # deadline
+                    int(time.time()) + 300,  # deadline
                 )._encode_transaction_data()
                 return encoded
 
             else:
-                print(f"Unknown DEX: {dex}")
+                logger.warning("Unknown DEX: %s", dex)
                 return "0x"
 
         except Exception as e:
-            print(f"Error encoding swap: {e}")
+            logger.error("Error encoding swap: %s", e)
             return "0x"
 
     def _encode_liquidation_call(self, collateral_token: str, debt_token: str, user: str) -> str:
@@ -441,11 +503,7 @@ class AvocadoIntegration:
             debt_token = Web3.to_checksum_address(debt_token)
             user = Web3.to_checksum_address(user)
 
-            # Get pool address
-            pool_address = CONTRACT_ADDRESSES[self.network]["aave_v3_pool"]
-
-            # Create contract instance for encoding
-            pool = self.web3.eth.contract(address=pool_address, abi=AAVE_V3_POOL_ABI)
+            pool = self._contracts["aave_v3_pool"]
 
             # Encode liquidationCall
             # liquidationCall(collateralAsset, debtAsset, user, debtToCover, receiveAToken)
@@ -459,5 +517,5 @@ class AvocadoIntegration:
             return encoded
 
         except Exception as e:
-            print(f"Error encoding liquidation: {e}")
+            logger.error("Error encoding liquidation: %s", e)
             return "0x"
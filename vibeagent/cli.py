@@ -6,6 +6,7 @@ Simple commands to generate DeFi strategies
 
 import click
 import json
+import logging
 import os
 from vibeagent.agent import VibeAgent
 from vibeagent.avocado_integration import AvocadoIntegration
@@ -17,7 +18,11 @@ init(autoreset=True)
 @click.group()
 def cli():
     """VibeAgent - AI-powered DeFi strategy generator for Avocado multi-sig wallet"""
-    pass
+    # Show the agent's analysis output; LOG_LEVEL=DEBUG adds per-DEX and per-account detail
+    logging.basicConfig(
+        level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
+        format="%(message)s",
+    )
 
 
 @cli.command()
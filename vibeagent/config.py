@@ -3,7 +3,7 @@ Configuration management for autonomous agent
 """
 
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -34,6 +34,12 @@ class AgentConfig:
         # DEXes to check
         self.enabled_dexes = self._parse_list(os.getenv("ENABLED_DEXES", "uniswap_v3,sushiswap"))
 
+        # Maximum number of calls per JSON-RPC batch (large batches get throttled)
+        self.rpc_batch_size = int(os.getenv("RPC_BATCH_SIZE", "20"))
+
+        # Maximum number of JSON-RPC batches sent concurrently
+        self.rpc_concurrency = int(os.getenv("RPC_CONCURRENCY", "4"))
+
         # Blacklisted addresses (tokens/contracts to avoid)
         self.blacklisted_addresses = self._parse_list(os.getenv("BLACKLISTED_ADDRESSES", ""))
 
@@ -57,9 +63,9 @@ class AgentConfig:
 
     @blacklisted_addresses.setter
     def blacklisted_addresses(self, addresses: List[str]):
-        """Update blacklist and maintain lowercase set for fast lookups"""
+        """Update blacklist and maintain lowercase frozenset for fast lookups"""
         self._blacklisted_addresses = addresses or []
-        self._blacklisted_set = {addr.lower() for addr in self._blacklisted_addresses}
+        self._blacklisted_set = frozenset(addr.lower() for addr in self._blacklisted_addresses)
 
     def _load_token_pairs(self) -> List[tuple]:
         """Load token pairs to monitor from config"""
@@ -87,6 +93,12 @@ class AgentConfig:
         """Check if an address is blacklisted"""
         return address.lower() in self._blacklisted_set
 
+    def any_blacklisted(self, addresses: Iterable[str]) -> bool:
+        """Check if any of the given addresses is blacklisted"""
+        if not self._blacklisted_set:
+            return False
+        return not self._blacklisted_set.isdisjoint(addr.lower() for addr in addresses)
+
     def is_profitable(self, profit_usd: float) -> bool:
         """Check if profit meets minimum threshold"""
         return profit_usd >= self.min_profit_usd
@@ -159,6 +159,38 @@ AAVE_V3_POOL_ABI = [
     },
 ]
 
+# Multicall3 (aggregate3 only, for batching calls that may revert)
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+]
+
 # Contract addresses on different networks
 CONTRACT_ADDRESSES = {
     "ethereum": {
@@ -166,17 +198,23 @@ CONTRACT_ADDRESSES = {
         "uniswap_v3_router": "0xE592427A0AEce92De3Edee1F18E0157C05861564",
         "sushiswap_router": "0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F",
         "aave_v3_pool": "0x87870Bca3F3fD6335C3F4ce8392D69350B4fA4E2",
+        "multicall3": "0xcA11bde05977b3631167028862bE2a173976CA11",
+        "chainlink_eth_usd": "0x5f4eC3Df9cbd43714FE2740f5E3616155c5b8419",
     },
     "polygon": {
         "uniswap_v3_quoter": "0xb27308f9F90D607463bb33eA1BeBb41C27CE5AB6",
         "uniswap_v3_router": "0xE592427A0AEce92De3Edee1F18E0157C05861564",
         "sushiswap_router": "0x1b02dA8Cb0d097eB8D57A175b88c7D8b47997506",
         "aave_v3_pool": "0x794a61358D6845594F94dc1DB02A252b5b4814aD",
+        "multicall3": "0xcA11bde05977b3631167028862bE2a173976CA11",
+        "chainlink_eth_usd": "0xF9680D99D6C9589e2a93a78A04A279e509205945",
     },
     "arbitrum": {
         "uniswap_v3_quoter": "0xb27308f9F90D607463bb33eA1BeBb41C27CE5AB6",
         "uniswap_v3_router": "0xE592427A0AEce92De3Edee1F18E0157C05861564",
         "sushiswap_router": "0x1b02dA8Cb0d097eB8D57A175b88c7D8b47997506",
         "aave_v3_pool": "0x794a61358D6845594F94dc1DB02A252b5b4814aD",
+        "multicall3": "0xcA11bde05977b3631167028862bE2a173976CA11",
+        "chainlink_eth_usd": "0x639Fe6ab55C921f74e7fac1ee960C0B6293ba612",
     },
 }
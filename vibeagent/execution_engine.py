@@ -2,7 +2,10 @@
 Execution engine for autonomous transaction execution
 """
 
-from typing import Dict, Any, Optional, Tuple
+from collections import deque
+from collections.abc import Mapping
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
 import time
 
@@ -11,13 +14,83 @@ from .logger import VibeLogger
 from .avocado_integration import AvocadoIntegration
 
 
+class ApprovalRecord:
+    """Manual approval request for an opportunity (slotted, as decided records pile up)"""
+
+    __slots__ = ("opportunity", "status", "submitted_at", "decided_at")
+
+    def __init__(
+        self,
+        opportunity: Dict[str, Any],
+        status: str = "pending",
+        submitted_at: Optional[str] = None,
+        decided_at: Optional[str] = None,
+    ):
+        self.opportunity = opportunity
+        self.status = status
+        self.submitted_at = submitted_at or datetime.now().isoformat()
+        self.decided_at = decided_at
+
+    def decide(self, status: str):
+        """Mark the approval as approved or rejected"""
+        self.status = status
+        self.decided_at = datetime.now().isoformat()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for the API (decision time as approved_at/rejected_at)"""
+        record = {
+            "opportunity": self.opportunity,
+            "submitted_at": self.submitted_at,
+            "status": self.status,
+        }
+        if self.decided_at is not None:
+            record[f"{self.status}_at"] = self.decided_at
+        return record
+
+
+class ApprovalsView(Mapping):
+    """
+    Live read-only view of pending and decided approvals, keyed by approval ID
+
+    Records are serialized with ApprovalRecord.to_dict() on lookup, so callers
+    get the same dicts as the API without the engine copying either map.
+    """
+
+    def __init__(self, pending: Dict[str, ApprovalRecord], archive: Dict[str, ApprovalRecord]):
+        self._maps = (pending, archive)
+
+    def __getitem__(self, approval_id: str) -> Dict[str, Any]:
+        for approvals in self._maps:
+            approval = approvals.get(approval_id)
+            if approval is not None:
+                return approval.to_dict()
+        raise KeyError(approval_id)
+
+    def __contains__(self, approval_id: object) -> bool:
+        return any(approval_id in approvals for approvals in self._maps)
+
+    def __iter__(self) -> Iterator[str]:
+        # An approval is either pending or decided, never both
+        for approvals in self._maps:
+            yield from approvals
+
+    def __len__(self) -> int:
+        return sum(len(approvals) for approvals in self._maps)
+
+
 class ExecutionEngine:
     """
     Handles execution of profitable opportunities
     Integrates with Avocado wallet for transaction submission
     """
 
-    def __init__(self, config: AgentConfig, logger: VibeLogger, network: str = "ethereum"):
+    def __init__(
+        self,
+        config: AgentConfig,
+        logger: VibeLogger,
+        network: str = "ethereum",
+        history_capacity: int = 10000,
+    ):
         self.config = config
         self.logger = logger
         self.network = network
@@ -31,12 +104,13 @@ class ExecutionEngine:
             self.avocado = None
             self.logger.warning("No Avocado wallet configured - execution disabled")
 
-        # Pending approvals for manual mode (optimized with separate pending set)
-        self.pending_approvals = {}
-        self._pending_ids = set()  # Use set for O(1) add/remove operations
+        # Approvals for manual mode: hot pending entries kept apart from decided ones
+        self.pending = {}
+        self.archive = {}
+        self._approvals_view = ApprovalsView(self.pending, self.archive)
 
-        # Execution history
-        self.execution_history = []
+        # Execution history (ring buffer: oldest records drop off once full)
+        self.execution_history = deque(maxlen=history_capacity)
 
         # Performance optimization: maintain running counters instead of iterating history
         self._stats_counters = {
@@ -71,11 +145,11 @@ class ExecutionEngine:
 
         # Check for blacklisted addresses
         token_pair = opportunity.get("token_pair", ())
-        for token in token_pair:
-            if self.config.is_address_blacklisted(token):
-                reason = f"Token {token} is blacklisted"
-                self.logger.log_safety_check_failed("blacklist", {"address": token})
-                return False, reason
+        if self.config.any_blacklisted(token_pair):
+            token = next(t for t in token_pair if self.config.is_address_blacklisted(t))
+            reason = f"Token {token} is blacklisted"
+            self.logger.log_safety_check_failed("blacklist", {"address": token})
+            return False, reason
 
         # Check if Avocado wallet is configured
         if not self.avocado:
@@ -119,14 +193,9 @@ class ExecutionEngine:
         Returns:
             Approval ID
         """
-        approval_id = f"approval_{int(time.time())}_{len(self.pending_approvals)}"
+        approval_id = f"approval_{int(time.time())}_{len(self.pending) + len(self.archive)}"
 
-        self.pending_approvals[approval_id] = {
-            "opportunity": opportunity,
-            "submitted_at": datetime.now().isoformat(),
-            "status": "pending",
-        }
-        self._pending_ids.add(approval_id)
+        self.pending[approval_id] = ApprovalRecord(opportunity)
 
         self.logger.info(f"Opportunity submitted for approval: {approval_id}")
         return approval_id
@@ -138,21 +207,18 @@ class ExecutionEngine:
         Returns:
             True if approved and queued for execution
         """
-        if approval_id not in self.pending_approvals:
-            self.logger.error(f"Approval ID not found: {approval_id}")
+        approval = self.pending.pop(approval_id, None)
+        if approval is None:
+            self.logger.error(f"Pending approval ID not found: {approval_id}")
             return False
 
-        approval = self.pending_approvals[approval_id]
-        approval["status"] = "approved"
-        approval["approved_at"] = datetime.now().isoformat()
-
-        # Remove from pending set (O(1) operation)
-        self._pending_ids.discard(approval_id)
+        approval.decide("approved")
+        self.archive[approval_id] = approval
 
         self.logger.info(f"Transaction approved: {approval_id}")
 
         # Execute immediately
-        return self._execute_opportunity(approval["opportunity"])
+        return self._execute_opportunity(approval.opportunity)
 
     def reject_transaction(self, approval_id: str) -> bool:
         """
@@ -161,15 +227,12 @@ class ExecutionEngine:
         Returns:
             True if rejected successfully
         """
-        if approval_id not in self.pending_approvals:
+        approval = self.pending.pop(approval_id, None)
+        if approval is None:
             return False
 
-        approval = self.pending_approvals[approval_id]
-        approval["status"] = "rejected"
-        approval["rejected_at"] = datetime.now().isoformat()
-
-        # Remove from pending set (O(1) operation)
-        self._pending_ids.discard(approval_id)
+        approval.decide("rejected")
+        self.archive[approval_id] = approval
 
         self.logger.info(f"Transaction rejected: {approval_id}")
         return True
@@ -254,16 +317,48 @@ class ExecutionEngine:
             self._stats_counters["failed"] += 1
             return False
 
+    @property
+    def pending_approvals(self) -> ApprovalsView:
+        """All approvals, pending and decided, as a read-only view of API dicts"""
+        return self._approvals_view
+
     def get_pending_approvals(self) -> list:
-        """Get list of pending approvals using optimized pending IDs set"""
+        """Get list of pending approvals without scanning decided ones"""
         return [
-            {"approval_id": approval_id, **self.pending_approvals[approval_id]}
-            for approval_id in self._pending_ids
+            {"approval_id": approval_id, **approval.to_dict()}
+            for approval_id, approval in self.pending.items()
         ]
 
+    def bulk_record(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Record already-executed transactions (e.g. replayed history) in one pass
+
+        Counters are bumped once for the whole batch rather than per record.
+        """
+        records = list(records)
+        self.execution_history.extend(records)
+
+        successful = failed = 0
+        profit = 0.0
+        for record in records:
+            status = record.get("status")
+            if status == "success":
+                successful += 1
+                profit += record.get("actual_profit_usd", 0)
+            elif status == "failed":
+                failed += 1
+
+        counters = self._stats_counters
+        counters["total_executions"] += len(records)
+        counters["successful"] += successful
+        counters["failed"] += failed
+        counters["total_profit_usd"] += profit
+
     def get_execution_history(self, limit: int = 50) -> list:
-        """Get execution history"""
-        return self.execution_history[-limit:]
+        """Get the most recent executions, oldest first"""
+        recent = list(islice(reversed(self.execution_history), max(limit, 0)))
+        recent.reverse()
+        return recent
 
     def get_stats(self) -> Dict[str, Any]:
         """Get execution statistics using cached counters for O(1) performance"""
@@ -272,5 +367,7 @@ class ExecutionEngine:
             "successful": self._stats_counters["successful"],
             "failed": self._stats_counters["failed"],
             "total_profit_usd": self._stats_counters["total_profit_usd"],
-            "pending_approvals": len(self.get_pending_approvals()),
+            "pending_approvals": len(self.pending),
+            "history_size": len(self.execution_history),
+            "history_capacity": self.execution_history.maxlen,
         }
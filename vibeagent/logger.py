@@ -4,36 +4,75 @@ Comprehensive logging system for autonomous agent
 
 import logging
 import json
+import os
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 
+def _tail_lines(path: str, n: int, chunk_size: int = 8192) -> List[bytes]:
+    """Return the last n non-empty lines of a file, reading backwards from the end"""
+    if n <= 0:
+        return []
+
+    chunks = []
+    newlines = 0
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        # n complete lines need n + 1 newlines (the one ending the previous line)
+        while position > 0 and newlines <= n:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+
+    lines = [line for line in b"".join(reversed(chunks)).splitlines() if line.strip()]
+    return lines[-n:]
+
+
 class VibeLogger:
     """Logger for VibeAgent operations"""
 
-    def __init__(self, log_file: str = "vibeagent.log", log_level: str = "INFO"):
+    def __init__(
+        self,
+        log_file: Optional[str] = "vibeagent.log",
+        log_level: str = "INFO",
+        transaction_log_file: Optional[str] = "transactions.jsonl",
+    ):
+        """
+        Args:
+            log_file: Log file path, or None to skip file logging
+            log_level: Logging level name (default: INFO)
+            transaction_log_file: JSONL audit trail path, or None to disable it
+        """
         self.log_file = log_file
         self.log_level = getattr(logging, log_level.upper(), logging.INFO)
         self._setup_logger()
 
         # Transaction log for audit trail
-        self.transaction_log_file = "transactions.jsonl"
+        self.transaction_log_file = transaction_log_file
 
     def _setup_logger(self):
         """Setup logger with file and console handlers"""
         self.logger = logging.getLogger("vibeagent")
         self.logger.setLevel(self.log_level)
+        # Print vibeagent.* records here only; a root handler (e.g. the CLI's) would repeat them
+        self.logger.propagate = False
 
         # Remove existing handlers
         self.logger.handlers.clear()
 
         # File handler
-        file_handler = logging.FileHandler(self.log_file)
-        file_handler.setLevel(self.log_level)
-        file_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
+        if self.log_file:
+            file_handler = logging.FileHandler(self.log_file)
+            file_handler.setLevel(self.log_level)
+            file_formatter = logging.Formatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+            )
+            file_handler.setFormatter(file_formatter)
+            self.logger.addHandler(file_handler)
 
         # Console handler
         console_handler = logging.StreamHandler()
@@ -94,6 +133,9 @@ class VibeLogger:
 
     def _log_transaction_to_file(self, status: str, tx_hash: str, data: Dict[str, Any]):
         """Log transaction to JSONL audit file"""
+        if not self.transaction_log_file:
+            return
+
         log_entry = {
             "timestamp": datetime.now().isoformat(),
             "status": status,
@@ -109,16 +151,13 @@ class VibeLogger:
 
     def get_transaction_history(self, limit: int = 100) -> list:
         """Get transaction history from log file"""
-        if not Path(self.transaction_log_file).exists():
+        if not self.transaction_log_file or not Path(self.transaction_log_file).exists():
             return []
 
         try:
-            from collections import deque
-
-            with open(self.transaction_log_file, "r") as f:
-                # Use deque to efficiently get last N lines
-                recent_lines = deque(f, maxlen=limit)
-                return [json.loads(line) for line in recent_lines]
+            # Seek backwards from the end so older history is never read
+            recent_lines = _tail_lines(self.transaction_log_file, limit)
+            return [json.loads(line) for line in recent_lines]
         except Exception as e:
             self.error(f"Failed to read transaction history: {e}")
             return []
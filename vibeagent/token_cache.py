@@ -0,0 +1,65 @@
+"""
+Persistent token metadata cache
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TokenCache(dict):
+    """
+    Token metadata cache backed by SQLite so it survives process restarts
+
+    Keys are (checksummed address, field) tuples, as in VibeAgent's in-memory
+    cache. ERC20 decimals and symbols never change, so entries never expire.
+    Reads are plain dict lookups; only writes touch the database.
+    """
+
+    def __init__(self, path: str, network: str):
+        """
+        Load the cached metadata for a network
+
+        Args:
+            path: SQLite database file (created if missing, ~ is expanded)
+            network: Network the cached tokens belong to
+        """
+        super().__init__()
+        self.path = os.path.expanduser(path)
+        self.network = network
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS token_metadata ("
+                "network TEXT, address TEXT, field TEXT, value TEXT, "
+                "PRIMARY KEY (network, address, field))"
+            )
+        rows = self._conn.execute(
+            "SELECT address, field, value FROM token_metadata WHERE network = ?", (network,)
+        )
+        for address, field, value in rows:
+            super().__setitem__((address, field), json.loads(value))
+
+    def __setitem__(self, key: Tuple[str, str], value: Any):
+        super().__setitem__(key, value)
+        address, field = key
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO token_metadata VALUES (?, ?, ?, ?)",
+                    (self.network, address, field, json.dumps(value)),
+                )
+        except sqlite3.Error as e:
+            # The in-memory entry is still usable; only persistence is lost
+            logger.error("Error persisting token metadata for %s: %s", address, e)
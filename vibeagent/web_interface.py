@@ -6,7 +6,6 @@ No-code interface for non-technical users
 from flask import Flask, render_template, request, jsonify, send_file, send_from_directory
 from flask_cors import CORS
 import os
-import json
 from datetime import datetime
 from vibeagent.agent import VibeAgent
 from vibeagent.avocado_integration import AvocadoIntegration
@@ -27,6 +26,35 @@ config = AgentConfig()
 logger = VibeLogger(log_file=config.log_file, log_level=config.log_level)
 autonomous_scanner = None
 
+# Strategy templates served by /api/templates (static, built once at import)
+STRATEGY_TEMPLATES = {
+    "arbitrage": {
+        "name": "DEX Arbitrage",
+        "description": "Find price differences between DEXes and profit from arbitrage",
+        "parameters": [
+            {"name": "token_a", "type": "address", "description": "First token address"},
+            {"name": "token_b", "type": "address", "description": "Second token address"},
+            {"name": "dexes", "type": "array", "description": "List of DEXes to check"},
+        ],
+    },
+    "liquidation": {
+        "name": "Lending Protocol Liquidation",
+        "description": "Find and execute liquidations on lending protocols",
+        "parameters": [
+            {
+                "name": "protocol",
+                "type": "string",
+                "description": "Lending protocol (aave, compound)",
+            },
+            {
+                "name": "account",
+                "type": "address",
+                "description": "Account to liquidate (optional)",
+            },
+        ],
+    },
+}
+
 
 @app.route("/")
 def index():
@@ -100,9 +128,12 @@ def scan_liquidation():
     data = request.json
     protocol = data.get("protocol", "aave")
     account = data.get("account")
+    accounts = data.get("accounts")
 
     try:
-        opportunities = agent.analyze_liquidation_opportunity(protocol=protocol, account=account)
+        opportunities = agent.analyze_liquidation_opportunity(
+            protocol=protocol, account=account, accounts=accounts
+        )
 
         # Generate strategies for each opportunity
         for opp in opportunities:
@@ -127,11 +158,12 @@ def export_strategy():
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"/tmp/avocado_tx_{timestamp}.json"
 
-        # Export strategy
-        json_output = avocado.export_for_transaction_builder(strategy, filename)
+        # Build the batch once and return it as-is rather than re-parsing the export
+        transaction_batch = avocado.build_transaction_batch(strategy)
+        avocado.save_transaction_batch(transaction_batch, filename)
 
         return jsonify(
-            {"success": True, "filename": filename, "transaction_batch": json.loads(json_output)}
+            {"success": True, "filename": filename, "transaction_batch": transaction_batch}
         )
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 400
@@ -166,35 +198,7 @@ def get_strategies():
 @app.route("/api/templates", methods=["GET"])
 def get_templates():
     """Get strategy templates"""
-    templates = {
-        "arbitrage": {
-            "name": "DEX Arbitrage",
-            "description": "Find price differences between DEXes and profit from arbitrage",
-            "parameters": [
-                {"name": "token_a", "type": "address", "description": "First token address"},
-                {"name": "token_b", "type": "address", "description": "Second token address"},
-                {"name": "dexes", "type": "array", "description": "List of DEXes to check"},
-            ],
-        },
-        "liquidation": {
-            "name": "Lending Protocol Liquidation",
-            "description": "Find and execute liquidations on lending protocols",
-            "parameters": [
-                {
-                    "name": "protocol",
-                    "type": "string",
-                    "description": "Lending protocol (aave, compound)",
-                },
-                {
-                    "name": "account",
-                    "type": "address",
-                    "description": "Account to liquidate (optional)",
-                },
-            ],
-        },
-    }
-
-    return jsonify({"success": True, "templates": templates})
+    return jsonify({"success": True, "templates": STRATEGY_TEMPLATES})
 
 
 @app.route("/api/download/<filename>")